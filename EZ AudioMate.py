@@ -1,482 +1,912 @@
-# This script analyzes and resamples WAV files to a predefined sampling rate from a user selected folder
-# Created by Jared Stephens 08/11/2023
-# Edited: JS - 02/16/2024
-    # Adjusted "process_files" and "get_output_filename" functions to accommodate .WAV and .aif files.
-# Edits JS - 11/10/2024
-    # Adjusted "process_files" and get_output_filename" fucntion to accomodate .flac files
-    # Added a "compress_to_flac" function to convert .wav and .aif files to .flac
-# Edited JS - 11/24/2024 
-    # Updated the UI to include separate tabs for resampling and FLAC conversion
-    # Fixed the bugs with the progress bar labels so it displays correct files being processed
-# Edited JS - 01/27/2025 
-    # Added a tab for converting .flac files to .wav files
-    # Added help pages on each tab
-# Edited JS - 05/16/2025
-    # Changed name from EZ Decimator to EZ AudioMate
-
-# Pip install Pillow
-import os
-import librosa
-import soundfile as sf
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from tkinter import ttk
-from tkinter.ttk import Progressbar
-from PIL import Image, ImageTk
-import threading
-
-##########################################################################
-#       READ INPUT AND OUTPUT FOLDERS
-##########################################################################
-
-# Function to browse and set the input folder
-def browse_input_folder(): # Resampling
-    folder_path = filedialog.askdirectory()
-    input_folder_var.set(folder_path)
-
-def browse_input_folder2(): # Convert to FLAC
-    folder_path = filedialog.askdirectory()
-    input_folder_var2.set(folder_path)
-
-def browse_input_folder3(): # Convert to WAV
-    folder_path = filedialog.askdirectory()
-    input_folder_var3.set(folder_path)
-
-# Function to browse and set the output folder
-def browse_output_folder(): # Resampling
-    folder_path = filedialog.askdirectory()
-    output_folder_var.set(folder_path)
-
-def browse_output_folder2(): # Convert to FLAC
-    folder_path = filedialog.askdirectory()
-    output_folder_var2.set(folder_path)
-
-def browse_output_folder3(): # Convert to WAV
-    folder_path = filedialog.askdirectory()
-    output_folder_var3.set(folder_path)
-
-##########################################################################
-#       FUNCTIONS TO RESAMPLE FILES AND UPDATE PROGRESS BAR
-##########################################################################
-
-# Function to resample a file
-def process_file(filename, desired_sr):
-    file_path = os.path.join(input_folder_var.get(), filename)
-    y, sr = librosa.load(file_path, sr=None)
-    y_resampled = librosa.resample(y, orig_sr=sr, target_sr=desired_sr)
-
-    output_filename = get_output_filename(filename, desired_sr)
-    output_path = os.path.join(output_folder_var.get(), output_filename)
-
-    sf.write(output_path, y_resampled, desired_sr)
-
-# Function to update the progress bar and status label
-def update_progress(filename):
-    progress['value'] += 1
-    label_status.config(text=f'Processing: {filename}')
-    root.update_idletasks()
-
-##########################################################################
-#       FUNCTION TO READ FOLDER AND  APPLY RESAMPLING FUNCTION
-##########################################################################
-
-# Function to process files and update progress bar
-def process_files():
-    input_folder = input_folder_var.get()
-    desired_sr = int(desired_sr_entry.get())
-    files_to_process = [filename for filename in os.listdir(input_folder) if filename.lower().endswith((".wav", ".aif", ".flac", ".WAV"))]
-    if not files_to_process:
-        messagebox.showerror("Error", "No valid audio files found in the folder.")
-        label_status.config(text='No valid audio files found.')
-        return
-
-    total_files = len(files_to_process)
-    progress['maximum'] = total_files
-
-    for idx, filename in enumerate(files_to_process, start=1):
-        process_file(filename, desired_sr)
-
-        # Update progress bar and status
-        progress['value'] = idx
-        label_status.config(text=f'Processing: {filename} ({idx}/{total_files})')
-        root.update_idletasks()
-
-    messagebox.showinfo("Info", "Resampling and saving completed!")
-    label_status.config(text='Resampling and saving completed.')
-    progress['value'] = 0  # Reset the progress bar
-
-
-##########################################################################
-#       FUNCTION TO CONVERT TO FLAC
-##########################################################################
-
-def compress_to_flac():
-    input_folder = input_folder_var2.get()
-    output_folder = output_folder_var2.get()
-    files_to_compress = [f for f in os.listdir(input_folder) if f.lower().endswith((".wav", ".aif", ".WAV"))]
-    
-    if not files_to_compress:
-        messagebox.showerror("Error", "Error: no .wav or .aif files found in the folder")
-        label_status_tab2.config(text='No .wav or .aif files found.')
-        return
-    
-    progress_tab2['maximum'] = len(files_to_compress)
-
-    for idx, filename in enumerate(files_to_compress, start=1):
-        file_path = os.path.join(input_folder, filename)
-        y, sr = librosa.load(file_path, sr=None)
-
-        # Construct the output file path
-        output_filename = os.path.splitext(filename)[0] + ".flac"  # Change extension to .flac
-        output_path = os.path.join(output_folder, output_filename)  # Combine folder and filename
-
-        # Write to .flac file
-        sf.write(output_path, y, sr, format='FLAC')
-
-        # Update progress bar and status
-        progress_tab2['value'] = idx
-        label_status_tab2.config(text=f'Processing: {filename} ({idx}/{len(files_to_compress)})')
-        root.update_idletasks()
-
-    messagebox.showinfo("Info", "Compression to FLAC completed!")
-    label_status_tab2.config(text='Compression to FLAC completed.')
-    progress_tab2['value'] = 0  # Reset the progress bar
-
-
-##########################################################################
-#       FUNCTION TO CONVERT TO WAV
-##########################################################################
-
-def convert_to_wav():
-    input_folder = input_folder_var3.get()
-    output_folder = output_folder_var3.get()
-    files_to_compress = [f for f in os.listdir(input_folder) if f.lower().endswith((".flac"))]
-    
-    if not files_to_compress:
-        messagebox.showerror("Error", "Error: no .flac files found in the folder")
-        label_status_tab3.config(text='No .flac files found.')
-        return
-    
-    progress_tab3['maximum'] = len(files_to_compress)
-
-    for idx, filename in enumerate(files_to_compress, start=1):
-        file_path = os.path.join(input_folder, filename)
-        y, sr = librosa.load(file_path, sr=None)
-
-        # Construct the output file path
-        output_filename = os.path.splitext(filename)[0] + ".wav"  # Change extension to .flac
-        output_path = os.path.join(output_folder, output_filename)  # Combine folder and filename
-
-        # Write to .flac file
-        sf.write(output_path, y, sr, format='WAV')
-
-        # Update progress bar and status
-        progress_tab3['value'] = idx
-        label_status_tab3.config(text=f'Processing: {filename} ({idx}/{len(files_to_compress)})')
-        root.update_idletasks()
-
-    messagebox.showinfo("Info", "Conversion to WAV completed!")
-    label_status_tab3.config(text='Conversion to WAV completed.')
-    progress_tab3['value'] = 0  # Reset the progress bar
-
-##########################################################################
-#       FUNCTIONS TO APPLY THREADING AND CHANGE FILE NAME (IF SELECTED)
-##########################################################################
-
-# Perform process threading
-def resample_and_save():
-    # Create a thread to process the files
-    processing_thread = threading.Thread(target=process_files)
-    processing_thread.start()
-
-# Function to get the modified output filename based on the checkbox state
-def get_output_filename(filename, desired_sr):
-    if include_sr_in_filename_var.get() == 1:
-        base, ext = os.path.splitext(filename)
-        return f"{base}_{desired_sr}Hz{ext}"
-    else:
-        return filename
-
-##########################################################################
-#       HELP PAGES FOR EACH TAB
-##########################################################################
-
-# Help text function
-def show_help():
-    help_text = (
-        "Welcome to EZ AudioMate!\n\n"
-        "This tab allows you to resample audio files based on a given sampling rate. To use this program, simply:\n\n"
-        "   1. Provide the input folder with original audio files.\n\n"
-        "   2. Provide the output folder in which the files will be\n"
-        "       downloaded too.\n\n"
-        "   3. Insert the desired sampling rate.\n\n"
-        "   4. Select if the sampling rate should be included in the file\n"
-        "       name of the new resampled files. \n\n"
-        "   5. Click 'Resample and Save'.\n\n"
-        "Depending on the size of the files being processed this may take a few minutes.\n\n"
-        "Thank you for using EZ AudioMate!"
-    )
-    messagebox.showinfo("Help", help_text)
-
-def show_help2():
-    help_text = (
-        "This tab allows you to convert .wav, .WAV, or .aif files to .flac format. To use this program, simply:\n\n"
-        "   1. Provide the input folder with original audio files.\n\n"
-        "   2. Provide the output folder in which the files will be\n"
-        "       downloaded too.\n\n"
-        "   3. Click 'Convert to FLAC'.\n\n"
-        "Depending on the size of the files being processed this may take a few minutes.\n\n"
-        "Thank you for using EZ AudioMate!"
-    )
-    messagebox.showinfo("Help", help_text)
-
-def show_help3():
-    help_text = (
-        "This tab allows you to convert .flac files to .wav format. To use this program, simply:\n\n"
-        "   1. Provide the input folder with original audio files.\n\n"
-        "   2. Provide the output folder in which the files will be\n"
-        "       downloaded too.\n\n"
-        "   3. Click 'Convert to WAV'\n\n"
-        "Depending on the size of the files being processed this may take a few minutes.\n\n"
-        "Thank you for using EZ AudioMate!"
-    )
-    messagebox.showinfo("Help", help_text)
-
-
-
-##########################################################################
-#       GUI --> CREATE FRAME WITH TAB HEADERS
-##########################################################################
-
-# Create the main application window
-root = tk.Tk()
-root.title("EZ AudioMate")
-root.configure(bg='DodgerBlue4')
-root.geometry("800x600")
-
-# Create a notebook for tabs at the very top
-notebook = ttk.Notebook(root)
-notebook.pack(fill=tk.BOTH, expand=True)
-
-# Create frames for the two tabs
-tab1 = tk.Frame(notebook, bg='DodgerBlue4')
-tab2 = tk.Frame(notebook, bg='DodgerBlue4')
-tab3 = tk.Frame(notebook, bg='DodgerBlue4')
-
-notebook.add(tab1, text="Resampling")
-notebook.add(tab2, text="FLAC Conversion")
-notebook.add(tab3, text="WAV Conversion")
-
-# Shared header: Logo and title in each tab
-def create_tab_header(parent):
-    # Create a frame for the header inside the parent tab
-    header_frame = tk.Frame(parent, bg='DodgerBlue4')
-    header_frame.pack(side=tk.TOP, anchor='nw', pady=10, padx=10, fill=tk.X)
-
-    # Load the company logo image
-    logo_image = Image.open("white_square_OSA_med.jpg")
-    logo_image = logo_image.resize((100, 100), Image.LANCZOS)
-    logo_photo = ImageTk.PhotoImage(logo_image)
-
-    # Display the company logo
-    logo_label = tk.Label(header_frame, image=logo_photo, bg='DodgerBlue4')
-    logo_label.image = logo_photo  # Keep reference to avoid garbage collection
-    logo_label.pack(side=tk.LEFT)
-
-    # Add a label for "EZ Decimator" next to the logo
-    ez_decimator_label = tk.Label(
-        header_frame, text="EZ AudioMate", bg='DodgerBlue4', fg='white',
-        font=("Times New Roman", 24, "bold")
-    )
-    ez_decimator_label.pack(side=tk.LEFT, padx=10)
-
-# Add the shared header to each tab
-create_tab_header(tab1)
-create_tab_header(tab2)
-create_tab_header(tab3)
-
-##########################################################################
-#       GUI --> TAB 1 = VARIABLES, HELP BUTTON, AND BOARDER
-##########################################################################
-
-# Tab 1: Resampling UI
-input_folder_var = tk.StringVar()
-output_folder_var = tk.StringVar()
-include_sr_in_filename_var = tk.IntVar()
-
-# Add help button function and placement on tab1
-help_button_tab1 = tk.Button(tab1, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help)
-help_button_tab1.pack(padx=10, pady=10)
-help_button_tab1.place(relx=0.95, rely=0.06, anchor=tk.NE)
-
-# Add a canvas to draw the border around the widgets
-canvas_border1= tk.Canvas(tab1, bg='DodgerBlue4', highlightthickness=0)
-canvas_border1.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
-# Draw the initial border
-canvas_border1.create_rectangle(10, 10, 685, 385, outline="white", width=2)
-
-
-##########################################################################
-#       GUI --> TAB 1 = WIDGETS AND INPUTS
-##########################################################################
-
-# Input folder selection
-input_folder_label = tk.Label(tab1, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-input_folder_label.pack(pady=5)
-input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
-input_folder_entry = tk.Entry(tab1, textvariable=input_folder_var, width=40)
-input_folder_entry.pack(pady=5)
-input_folder_entry.place(relx=0.3, rely=0.32, anchor=tk.CENTER)
-browse_input_button = tk.Button(tab1, text="Browse", command=browse_input_folder, font=("Times New Roman", 12), bd=0, width=18)
-browse_input_button.pack(pady=5)
-browse_input_button.place(relx=0.3, rely=0.37, anchor=tk.CENTER)
-
-# Output folder selection
-output_folder_label = tk.Label(tab1, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-output_folder_label.pack(pady=5)
-output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
-output_folder_entry = tk.Entry(tab1, textvariable=output_folder_var, width=40)
-output_folder_entry.pack(pady=5)
-output_folder_entry.place(relx=0.3, rely=0.51, anchor=tk.CENTER)
-browse_output_button = tk.Button(tab1, text="Browse", command=browse_output_folder, font=("Times New Roman", 12), bd=0, width=18)
-browse_output_button.pack(pady=5)
-browse_output_button.place(relx=0.3, rely=0.56, anchor=tk.CENTER)
-
-# Desired sampling rate
-desired_sr_label = tk.Label(tab1, text="Desired Sampling Rate (Hz):", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-desired_sr_label.pack(pady=5)
-desired_sr_label.place(relx=0.7, rely=0.28, anchor=tk.CENTER)
-desired_sr_entry = tk.Entry(tab1, width=40)
-desired_sr_entry.pack(pady=5)
-desired_sr_entry.place(relx=0.7, rely=0.32, anchor=tk.CENTER)
-
-# Checkbox for including desired sampling rate in the filename
-include_sr_checkbox = tk.Checkbutton(tab1, text="Include Desired SR in Filename", variable=include_sr_in_filename_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
-include_sr_checkbox.pack(pady=5)
-include_sr_checkbox.place(relx=0.73, rely=0.51, anchor=tk.CENTER)
-
-# Resample button
-resample_button = tk.Button(tab1, text="Resample and Save", bg='light blue', fg='black', font=("Times New Roman", 16), command=resample_and_save, width=20)
-resample_button.pack(pady=20)
-resample_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
-
-# Progress bar and status label
-progress = Progressbar(tab1, length=300, mode='determinate')
-progress.pack(pady=5)
-progress.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
-label_status = tk.Label(tab1, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
-label_status.pack(pady=5)
-label_status.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
-
-##########################################################################
-#       GUI --> TAB 2 = CONVERT TO FLAC
-##########################################################################
-
-# Tab 2: Compress to FLAC
-input_folder_var2 = tk.StringVar()
-output_folder_var2 = tk.StringVar()
-
-help_button_tab2 = tk.Button(tab2, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help2)
-help_button_tab2.pack(padx=10, pady=10)
-help_button_tab2.place(relx=0.95, rely=0.06, anchor=tk.NE)
-
-# Add a canvas to draw the border around the widgets
-canvas_border2= tk.Canvas(tab2, bg='DodgerBlue4', highlightthickness=0)
-canvas_border2.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
-# Draw the initial border
-canvas_border2.create_rectangle(10, 10, 685, 385, outline="white", width=2)
-
-# Input folder selection
-input_folder_label = tk.Label(tab2, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-input_folder_label.pack(pady=5)
-input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
-input_folder_entry = tk.Entry(tab2, textvariable=input_folder_var2, width=50)
-input_folder_entry.pack(pady=5)
-input_folder_entry.place(relx=0.6, rely=0.34, anchor=tk.CENTER)
-browse_input_button = tk.Button(tab2, text="Browse", command=browse_input_folder2, font=("Times New Roman", 12), bd=0, width=16)
-browse_input_button.pack(pady=5)
-browse_input_button.place(relx=0.3, rely=0.34, anchor=tk.CENTER)
-
-# Output folder selection
-output_folder_label = tk.Label(tab2, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-output_folder_label.pack(pady=5)
-output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
-output_folder_entry = tk.Entry(tab2, textvariable=output_folder_var2, width=50)
-output_folder_entry.pack(pady=5)
-output_folder_entry.place(relx=0.6, rely=0.53, anchor=tk.CENTER)
-browse_output_button = tk.Button(tab2, text="Browse", command=browse_output_folder2, font=("Times New Roman", 12), bd=0, width=16)
-browse_output_button.pack(pady=5)
-browse_output_button.place(relx=0.3, rely=0.53, anchor=tk.CENTER)
-
-# Compress to  FLAC button
-compress_button = tk.Button(tab2, text="Convert to FLAC", bg='light blue', fg='black', font=("Times New Roman", 16), command=compress_to_flac, width=20)
-compress_button.pack(pady=20)
-compress_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
-
-# Progress bar and status label for Tab 2
-progress_tab2 = Progressbar(tab2, length=300, mode='determinate')
-progress_tab2.pack(pady=5)
-progress_tab2.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
-
-label_status_tab2 = tk.Label(tab2, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
-label_status_tab2.pack(pady=5)
-label_status_tab2.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
-
-##########################################################################
-#       GUI --> TAB 3 = CONVERT TO WAV
-##########################################################################
-
-# Tab 3: Convert to WAV
-input_folder_var3= tk.StringVar()
-output_folder_var3 = tk.StringVar()
-
-help_button_tab3 = tk.Button(tab3, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help3)
-help_button_tab3.pack(padx=10, pady=10)
-help_button_tab3.place(relx=0.95, rely=0.06, anchor=tk.NE)
-
-# Add a canvas to draw the border around the widgets
-canvas_border3= tk.Canvas(tab3, bg='DodgerBlue4', highlightthickness=0)
-canvas_border3.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
-# Draw the initial border
-canvas_border3.create_rectangle(10, 10, 685, 385, outline="white", width=2)
-
-# Input folder selection
-input_folder_label = tk.Label(tab3, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-input_folder_label.pack(pady=5)
-input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
-input_folder_entry = tk.Entry(tab3, textvariable=input_folder_var3, width=50)
-input_folder_entry.pack(pady=5)
-input_folder_entry.place(relx=0.6, rely=0.34, anchor=tk.CENTER)
-browse_input_button = tk.Button(tab3, text="Browse", command=browse_input_folder3, font=("Times New Roman", 12), bd=0, width=16)
-browse_input_button.pack(pady=5)
-browse_input_button.place(relx=0.3, rely=0.34, anchor=tk.CENTER)
-
-# Output folder selection
-output_folder_label = tk.Label(tab3, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
-output_folder_label.pack(pady=5)
-output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
-output_folder_entry = tk.Entry(tab3, textvariable=output_folder_var3, width=50)
-output_folder_entry.pack(pady=5)
-output_folder_entry.place(relx=0.6, rely=0.53, anchor=tk.CENTER)
-browse_output_button = tk.Button(tab3, text="Browse", command=browse_output_folder3, font=("Times New Roman", 12), bd=0, width=16)
-browse_output_button.pack(pady=5)
-browse_output_button.place(relx=0.3, rely=0.53, anchor=tk.CENTER)
-
-# Convert to WAV button
-compress_button = tk.Button(tab3, text="Convert to WAV", bg='light blue', fg='black', font=("Times New Roman", 16), command=convert_to_wav, width=20)
-compress_button.pack(pady=20)
-compress_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
-
-# Progress bar and status label for Tab 3
-progress_tab3 = Progressbar(tab3, length=300, mode='determinate')
-progress_tab3.pack(pady=5)
-progress_tab3.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
-
-label_status_tab3 = tk.Label(tab3, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
-label_status_tab3.pack(pady=5)
-label_status_tab3.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
-
-# Start the main event loop
-root.mainloop()
-
-
+# This script analyzes and resamples WAV files to a predefined sampling rate from a user selected folder
+# Created by Jared Stephens 08/11/2023
+# Edited: JS - 02/16/2024
+    # Adjusted "process_files" and "get_output_filename" functions to accommodate .WAV and .aif files.
+# Edits JS - 11/10/2024
+    # Adjusted "process_files" and get_output_filename" fucntion to accomodate .flac files
+    # Added a "compress_to_flac" function to convert .wav and .aif files to .flac
+# Edited JS - 11/24/2024 
+    # Updated the UI to include separate tabs for resampling and FLAC conversion
+    # Fixed the bugs with the progress bar labels so it displays correct files being processed
+# Edited JS - 01/27/2025 
+    # Added a tab for converting .flac files to .wav files
+    # Added help pages on each tab
+# Edited JS - 05/16/2025
+    # Changed name from EZ Decimator to EZ AudioMate
+# Edited - 10/18/2026
+    # Added a pool of worker processes to "process_files" so files are resampled in parallel
+    # Added a streaming mode that resamples large files block by block
+    # Added "fast", "balanced" and "best" quality presets (soxr MQ, HQ and VHQ filters; "balanced" is the former default)
+    # FLAC and WAV conversion now copy the samples as-is instead of decoding them to float (keeps bit depth and channels)
+    # Added a job manifest in each output folder so reruns skip finished files and resume interrupted runs
+    # Moved the processing code into the GUI-free "audiomate" package, which also has a command line (python -m audiomate)
+    # Added an "Include Subfolders" option to each tab; the output folder mirrors the input folder structure
+    # The Resampling tab accepts several sampling rates; each file is decoded once for all of them
+    # Added a "Prefetch Files" option to each tab that reads, processes and writes files in overlapping threads
+    # The status label shows the throughput and time left; each run saves a report (time per file and stage) in the output folder
+    # All tabs run their jobs in a shared background thread that posts progress events to the GUI, and have a Cancel button
+    # Added output sample format and dither options to each tab and a FLAC compression level to the FLAC tab
+    # Uncompressed WAV files (including RF64 and WAVE_FORMAT_EXTENSIBLE) are read through a memory map instead of being decoded
+    # Added start/end times and a split length to the Resampling tab to resample part of each file or cut it into segments
+    # Added a Channels setting to the Resampling tab: mix down to mono (as before), keep all channels, or keep some of them
+    # Added an Inventory button to the Resampling tab (duration, rates, channels and expected output size, from the file headers)
+    # Added a "Check First" option to the Resampling tab: it reads the file headers, shows the inventory and asks before resampling
+    # (its progress bar then follows the audio duration instead of the file count)
+    # Added a "Skip Same SR" option to the Resampling tab for files that are already at a desired rate
+
+# Pip install Pillow
+import os
+import queue
+import threading
+import multiprocessing
+from audiomate import core
+from audiomate.inventory import take_inventory
+
+##########################################################################
+#       READ INPUT AND OUTPUT FOLDERS
+##########################################################################
+
+# Function to browse and set the input folder
+def browse_input_folder(): # Resampling
+    folder_path = filedialog.askdirectory()
+    input_folder_var.set(folder_path)
+
+def browse_input_folder2(): # Convert to FLAC
+    folder_path = filedialog.askdirectory()
+    input_folder_var2.set(folder_path)
+
+def browse_input_folder3(): # Convert to WAV
+    folder_path = filedialog.askdirectory()
+    input_folder_var3.set(folder_path)
+
+# Function to browse and set the output folder
+def browse_output_folder(): # Resampling
+    folder_path = filedialog.askdirectory()
+    output_folder_var.set(folder_path)
+
+def browse_output_folder2(): # Convert to FLAC
+    folder_path = filedialog.askdirectory()
+    output_folder_var2.set(folder_path)
+
+def browse_output_folder3(): # Convert to WAV
+    folder_path = filedialog.askdirectory()
+    output_folder_var3.set(folder_path)
+
+##########################################################################
+#       FUNCTIONS TO UPDATE PROGRESS BAR
+##########################################################################
+
+# Function to describe the skipped files in the status label
+def get_skipped_text(skipped):
+    return f' {skipped} file(s) already up to date were skipped.' if skipped else ''
+
+# Function to describe a finished run in the completion message: throughput, time per stage and where the report is
+def get_report_text(summary):
+    text = '\n\n' + summary['report'].get_summary_text()
+    if summary['report_path']:
+        text += f"\n\nReport saved to:\n{summary['report_path']}"
+    return text
+
+# Function to get the end of a job for the GUI: (message box type, message, status label text)
+def get_job_end(summary, message, status):
+    if summary['cancelled']:
+        message, status = "Cancelled. The files in progress were finished and saved.", 'Cancelled.'
+    return 'info', message + get_report_text(summary), status + get_skipped_text(summary['skipped'])
+
+##########################################################################
+#       BACKGROUND JOBS (SHARED BY ALL TABS)
+##########################################################################
+
+# How often (in milliseconds) the GUI picks up the events posted by the running job
+EVENT_POLL_MS = 100
+
+# Events posted by the job thread; only the Tk main loop touches the widgets
+job_events = queue.Queue()
+# Set by the Cancel buttons; the running job stops after the files in progress
+job_cancel = threading.Event()
+job_thread = None
+
+# Function to run a job in a background thread (one job at a time)
+# job(update) gets a progress callback for the tab's progress bar and label, and returns the end of the job
+# (message box type, message, status label text); it must not touch the widgets or the Tk variables itself
+def start_job(job, progress_bar, label):
+    global job_thread
+    if job_thread is not None and job_thread.is_alive():
+        messagebox.showwarning("Busy", "A job is already running. Wait for it to finish or cancel it first.")
+        return
+
+    # Post a progress event after each file (or each header read by an inventory, which has no report)
+    def update(idx, total_files, filename, report=None):
+        if report is None:
+            text = f'Reading headers: {filename} ({idx}/{total_files})'
+            fraction = idx / total_files
+        else:
+            text = f'Processing: {filename} ({idx}/{total_files}) - {report.get_progress_text(idx, total_files)}'
+            fraction = report.get_progress_fraction(idx, total_files)
+        job_events.put(('progress', progress_bar, label, fraction, text))
+
+    def run():
+        try:
+            end = job(update)
+        except Exception as e:
+            end = 'error', f"Error: {type(e).__name__}: {e}", 'Stopped by an error.'
+        job_events.put(('end', progress_bar, label, *end))
+
+    job_cancel.clear()
+    label.config(text='Starting...')
+    job_thread = threading.Thread(target=run, daemon=True)
+    job_thread.start()
+
+# Function for a job to ask the user a yes/no question; the job waits while the Tk main loop shows the question
+def ask_from_job(title, message):
+    reply = {'answer': False, 'answered': threading.Event()}
+    job_events.put(('ask', title, message, reply))
+    reply['answered'].wait()
+    return reply['answer']
+
+# Function to cancel the running job
+def cancel_job():
+    if job_thread is not None and job_thread.is_alive():
+        job_cancel.set()
+
+# Function to show the events posted by the job, then check again in EVENT_POLL_MS
+# Only the newest progress of each progress bar is drawn, so fast runs (e.g. many skipped files) do not flood the GUI
+def drain_job_events():
+    latest_progress = {}
+
+    # Function to draw the newest progress of each bar
+    def draw_progress():
+        for _, progress_bar, label, fraction, text in latest_progress.values():
+            progress_bar['maximum'] = 100
+            progress_bar['value'] = 100 * fraction
+            label.config(text=text)
+        latest_progress.clear()
+
+    while True:
+        try:
+            event = job_events.get_nowait()
+        except queue.Empty:
+            break
+        if event[0] == 'progress':
+            latest_progress[event[1]] = event
+        elif event[0] == 'ask':
+            draw_progress()
+            _, title, message, reply = event
+            reply['answer'] = messagebox.askyesno(title, message)
+            reply['answered'].set()
+        else:
+            draw_progress()
+            _, progress_bar, label, kind, message, status = event
+            label.config(text=status)
+            progress_bar['value'] = 0  # Reset the progress bar
+            if kind == 'error':
+                messagebox.showerror("Error", message)
+            else:
+                messagebox.showinfo("Info", message)
+    draw_progress()
+    root.after(EVENT_POLL_MS, drain_job_events)
+
+##########################################################################
+#       FUNCTION TO READ FOLDER AND  APPLY RESAMPLING FUNCTION
+##########################################################################
+
+# Function to read the settings of the Resampling tab; returns (desired rates, settings), or None after showing
+# what is wrong with them
+def get_resample_settings():
+    try:
+        desired_sr = core.get_target_rates(desired_sr_entry.get())  # one or several rates, e.g. "48000, 16000"
+    except ValueError:
+        messagebox.showerror("Error", "Please enter the desired sampling rate(s) as positive whole numbers, e.g. 48000, 16000.")
+        return None
+    try:
+        window = get_time_window()
+    except ValueError as e:
+        messagebox.showerror("Error", f"Please check the start, end and split times (in seconds): {e}.")
+        return None
+    try:
+        channels = core.get_channels(channels_var.get())
+    except ValueError as e:
+        messagebox.showerror("Error", f"{e}.")
+        return None
+    settings = dict(include_sr=include_sr_in_filename_var.get() == 1,
+                    streaming=streaming_mode_var.get() == 1,
+                    quality=quality_var.get(),
+                    num_workers=get_num_workers(),
+                    skip_done=skip_done_var.get() == 1,
+                    recursive=recursive_var.get() == 1,
+                    pipeline=pipeline_var.get() == 1,
+                    encoding=core.get_encoding(subtype_var.get(), dither_var.get() == 1),
+                    window=window,
+                    channels=channels,
+                    skip_same_rate=skip_same_rate_var.get() == 1)
+    return desired_sr, settings
+
+# Function to read the resampling settings and resample the files in the background
+# With "Check First" the file headers are read first (see take_inventory) and the inventory is shown before anything is
+# resampled; the progress bar then follows the audio duration. Otherwise the files are resampled as they are found
+def process_files():
+    input_folder = input_folder_var.get()
+    output_folder = output_folder_var.get()
+    resample_settings = get_resample_settings()
+    if resample_settings is None:
+        return
+    desired_sr, settings = resample_settings
+    check_first = check_first_var.get() == 1
+
+    def job(update):
+        inventory = None
+        if check_first:
+            inventory = take_inventory(input_folder, core.RESAMPLE_EXTENSIONS, settings['recursive'], output_folder,
+                                       progress_callback=update, cancel_event=job_cancel)
+            if job_cancel.is_set():
+                return 'info', "Cancelled. No files were resampled.", 'Cancelled.'
+            if not inventory.files:
+                return 'error', "No valid audio files found in the folder.", 'No valid audio files found.'
+            text = inventory.get_summary_text(desired_sr, settings['window'], settings['channels'],
+                                              settings['encoding'], settings['skip_same_rate'])
+            if not ask_from_job("Check First", f"{text}\n\nResample these files?"):
+                return 'info', "Cancelled. No files were resampled.", 'Cancelled.'
+        try:
+            summary = core.resample_folder(input_folder, output_folder, desired_sr, progress_callback=update,
+                                           cancel_event=job_cancel, inventory=inventory, **settings)
+        except core.NoAudioFilesError:
+            return 'error', "No valid audio files found in the folder.", 'No valid audio files found.'
+        return get_job_end(summary, "Resampling and saving completed!", 'Resampling and saving completed.')
+
+    start_job(job, progress, label_status)
+
+# Function to read the headers of the files in the input folder in the background and show what the folder holds:
+# duration, sampling rates, channels and sample formats, and (with desired rates) the expected size of the outputs
+def show_inventory():
+    input_folder = input_folder_var.get()
+    output_folder = output_folder_var.get() or None  # the headers are cached in the output folder when there is one
+    if desired_sr_entry.get().strip():
+        resample_settings = get_resample_settings()
+        if resample_settings is None:
+            return
+        desired_sr, settings = resample_settings
+    else:
+        desired_sr, settings = None, dict(recursive=recursive_var.get() == 1, window=None,
+                                          channels=core.DEFAULT_CHANNELS, encoding=None, skip_same_rate=False)
+
+    def job(update):
+        inventory = take_inventory(input_folder, core.RESAMPLE_EXTENSIONS, settings['recursive'], output_folder,
+                                   progress_callback=update, cancel_event=job_cancel)
+        if not inventory.files:
+            return 'error', "No valid audio files found in the folder.", 'No valid audio files found.'
+        text = inventory.get_summary_text(desired_sr, settings['window'], settings['channels'], settings['encoding'],
+                                          settings['skip_same_rate'])
+        return 'info', text, f'Inventory: {len(inventory.files)} file(s).'
+
+    start_job(job, progress, label_status)
+
+
+##########################################################################
+#       FUNCTION TO CONVERT TO FLAC
+##########################################################################
+
+def compress_to_flac():
+    input_folder = input_folder_var2.get()
+    output_folder = output_folder_var2.get()
+    settings = dict(skip_done=skip_done_var2.get() == 1,
+                    recursive=recursive_var2.get() == 1,
+                    pipeline=pipeline_var2.get() == 1,
+                    encoding=core.get_encoding(subtype_var2.get(), dither_var2.get() == 1, get_flac_level()))
+
+    def job(update):
+        try:
+            summary = core.transcode_folder(input_folder, output_folder, 'FLAC', progress_callback=update,
+                                            cancel_event=job_cancel, **settings)
+        except core.NoAudioFilesError:
+            return 'error', "Error: no .wav or .aif files found in the folder", 'No .wav or .aif files found.'
+        return get_job_end(summary, "Compression to FLAC completed!", 'Compression to FLAC completed.')
+
+    start_job(job, progress_tab2, label_status_tab2)
+
+
+##########################################################################
+#       FUNCTION TO CONVERT TO WAV
+##########################################################################
+
+def convert_to_wav():
+    input_folder = input_folder_var3.get()
+    output_folder = output_folder_var3.get()
+    settings = dict(skip_done=skip_done_var3.get() == 1,
+                    recursive=recursive_var3.get() == 1,
+                    pipeline=pipeline_var3.get() == 1,
+                    encoding=core.get_encoding(subtype_var3.get(), dither_var3.get() == 1))
+
+    def job(update):
+        try:
+            summary = core.transcode_folder(input_folder, output_folder, 'WAV', progress_callback=update,
+                                            cancel_event=job_cancel, **settings)
+        except core.NoAudioFilesError:
+            return 'error', "Error: no .flac files found in the folder", 'No .flac files found.'
+        return get_job_end(summary, "Conversion to WAV completed!", 'Conversion to WAV completed.')
+
+    start_job(job, progress_tab3, label_status_tab3)
+
+##########################################################################
+#       FUNCTIONS TO READ SETTINGS
+##########################################################################
+
+# Function to read the number of worker processes (1 = resample the files sequentially)
+def get_num_workers():
+    try:
+        num_workers = int(num_workers_var.get())
+    except (ValueError, tk.TclError):
+        num_workers = 1
+    return max(1, num_workers)
+
+# Function to read the time window of the Resampling tab (empty boxes = from the start / to the end / not split)
+# Raises ValueError for times that are not numbers or cannot be used
+def get_time_window():
+    start, end, segment = (var.get().strip() or None for var in (start_time_var, end_time_var, segment_var))
+    return core.get_time_window(start or 0, end, segment)
+
+# Function to read the FLAC compression level (0 = fastest, 8 = smallest files)
+def get_flac_level():
+    try:
+        flac_level = int(flac_level_var.get())
+    except (ValueError, tk.TclError):
+        flac_level = core.DEFAULT_ENCODING['flac_level']
+    return min(max(flac_level, 0), 8)
+
+##########################################################################
+#       HELP PAGES FOR EACH TAB
+##########################################################################
+
+# Help text function
+def show_help():
+    help_text = (
+        "Welcome to EZ AudioMate!\n\n"
+        "This tab allows you to resample audio files based on a given sampling rate. To use this program, simply:\n\n"
+        "   1. Provide the input folder with original audio files.\n\n"
+        "   2. Provide the output folder in which the files will be\n"
+        "       downloaded too.\n\n"
+        "   3. Insert the desired sampling rate. Several rates can be given,\n"
+        "       separated by commas (e.g. 48000, 16000, 2000); each file is\n"
+        "       then read once and the rate is added to every file name.\n\n"
+        "   4. Select if the sampling rate should be included in the file\n"
+        "       name of the new resampled files. \n\n"
+        "   5. Set the number of worker processes. Files are resampled in\n"
+        "       parallel; use 1 to process one file at a time.\n\n"
+        "   6. Select 'Streaming Mode' for very long recordings. Files are\n"
+        "       read and resampled in blocks so they do not need to fit\n"
+        "       in memory.\n\n"
+        "   7. Choose a quality preset. 'balanced' is a good default; 'best'\n"
+        "       uses longer, sharper filters (slower) and 'fast' shorter ones.\n\n"
+        "   8. Leave 'Skip Files Already Done' selected to only process new\n"
+        "       or changed files (e.g. to resume an interrupted run).\n\n"
+        "   9. Select 'Include Subfolders' to also resample the files in all\n"
+        "       subfolders; the output folder gets the same folder structure.\n\n"
+        "   10. Select 'Prefetch Files' when the files are on a network\n"
+        "       drive. The next files are read while the current ones are\n"
+        "       resampled and saved (not used in Streaming Mode or with\n"
+        "       the start, end and split times of step 12).\n\n"
+        "   11. Choose the sample format of the new files ('source' keeps\n"
+        "       the one of the original files). Select 'Dither' to add a\n"
+        "       little noise when reducing the bit depth (e.g. to PCM_16).\n\n"
+        "   12. To resample only part of each file, enter a start and/or end\n"
+        "       time in seconds. Enter a split length (e.g. 600) to cut the\n"
+        "       files into segments; each segment's start time is added to\n"
+        "       its file name (e.g. _000600s). Leave them empty for whole files.\n\n"
+        "   13. Choose the channels: 'mono' mixes all channels into one,\n"
+        "       'all' keeps every channel, or enter the channel numbers to\n"
+        "       keep (e.g. 1, 3); the other channels are not processed.\n\n"
+        "   14. Select 'Skip Same SR' to leave out the files that are\n"
+        "       already at a desired sampling rate (they are not copied).\n\n"
+        "   15. Click 'Inventory' to see what the input folder holds before\n"
+        "       resampling: total duration, sampling rates, channels and the\n"
+        "       expected size of the new files. Only the file headers are read.\n"
+        "       Select 'Check First' to see it and confirm each time you click\n"
+        "       'Resample and Save'; the progress bar then follows the audio\n"
+        "       duration instead of the number of files.\n\n"
+        "   16. Click 'Resample and Save'.\n\n"
+        "Depending on the size of the files being processed this may take a few minutes.\n"
+        "A report of each run (time per file and stage) is saved in the\n"
+        "'ezaudiomate_reports' folder of the output folder.\n"
+        "Click 'Cancel' to stop after the files in progress; with 'Skip\n"
+        "Files Already Done' selected, the next run continues from there.\n\n"
+        "Thank you for using EZ AudioMate!"
+    )
+    messagebox.showinfo("Help", help_text)
+
+def show_help2():
+    help_text = (
+        "This tab allows you to convert .wav, .WAV, or .aif files to .flac format. To use this program, simply:\n\n"
+        "   1. Provide the input folder with original audio files.\n\n"
+        "   2. Provide the output folder in which the files will be\n"
+        "       downloaded too.\n\n"
+        "   3. Leave 'Skip Files Already Done' selected to only convert new\n"
+        "       or changed files (e.g. to resume an interrupted run).\n\n"
+        "   4. Select 'Include Subfolders' to also convert the files in all\n"
+        "       subfolders; the output folder gets the same folder structure.\n\n"
+        "   5. Select 'Prefetch Files' when the files are on a network\n"
+        "       drive. The next files are read while the current ones are\n"
+        "       being converted and saved.\n\n"
+        "   6. Choose the sample format ('source' keeps the one of the\n"
+        "       original files), 'Dither' when reducing the bit depth, and\n"
+        "       the FLAC level (0 = fastest, 8 = smallest files).\n\n"
+        "   7. Click 'Convert to FLAC'.\n\n"
+        "The channels and tags of the original files are kept, and with\n"
+        "'source' the bit depth too (32-bit and float files are stored\n"
+        "as 24-bit FLAC).\n\n"
+        "Depending on the size of the files being processed this may take a few minutes.\n"
+        "A report of each run (time per file and stage) is saved in the\n"
+        "'ezaudiomate_reports' folder of the output folder.\n"
+        "Click 'Cancel' to stop after the files in progress; with 'Skip\n"
+        "Files Already Done' selected, the next run continues from there.\n\n"
+        "Thank you for using EZ AudioMate!"
+    )
+    messagebox.showinfo("Help", help_text)
+
+def show_help3():
+    help_text = (
+        "This tab allows you to convert .flac files to .wav format. To use this program, simply:\n\n"
+        "   1. Provide the input folder with original audio files.\n\n"
+        "   2. Provide the output folder in which the files will be\n"
+        "       downloaded too.\n\n"
+        "   3. Leave 'Skip Files Already Done' selected to only convert new\n"
+        "       or changed files (e.g. to resume an interrupted run).\n\n"
+        "   4. Select 'Include Subfolders' to also convert the files in all\n"
+        "       subfolders; the output folder gets the same folder structure.\n\n"
+        "   5. Select 'Prefetch Files' when the files are on a network\n"
+        "       drive. The next files are read while the current ones are\n"
+        "       being converted and saved.\n\n"
+        "   6. Choose the sample format ('source' keeps the one of the\n"
+        "       original files) and 'Dither' when reducing the bit depth.\n\n"
+        "   7. Click 'Convert to WAV'\n\n"
+        "The channels and tags of the original files are kept, and with\n"
+        "'source' the bit depth too.\n\n"
+        "Depending on the size of the files being processed this may take a few minutes.\n"
+        "A report of each run (time per file and stage) is saved in the\n"
+        "'ezaudiomate_reports' folder of the output folder.\n"
+        "Click 'Cancel' to stop after the files in progress; with 'Skip\n"
+        "Files Already Done' selected, the next run continues from there.\n\n"
+        "Thank you for using EZ AudioMate!"
+    )
+    messagebox.showinfo("Help", help_text)
+
+
+
+##########################################################################
+#       GUI --> CREATE FRAME WITH TAB HEADERS
+##########################################################################
+
+# Only build the GUI in the main process; the resampling worker processes re-import this script
+if __name__ == "__main__":
+    # Needed for the worker processes when the app is frozen into an executable
+    multiprocessing.freeze_support()
+
+    # The GUI libraries are only loaded here, so the worker processes (and the audiomate package) never need them
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    from tkinter import ttk
+    from tkinter.ttk import Progressbar
+    from PIL import Image, ImageTk
+
+    # Create the main application window
+    root = tk.Tk()
+    root.title("EZ AudioMate")
+    root.configure(bg='DodgerBlue4')
+    root.geometry("800x600")
+
+    # Create a notebook for tabs at the very top
+    notebook = ttk.Notebook(root)
+    notebook.pack(fill=tk.BOTH, expand=True)
+
+    # Create frames for the two tabs
+    tab1 = tk.Frame(notebook, bg='DodgerBlue4')
+    tab2 = tk.Frame(notebook, bg='DodgerBlue4')
+    tab3 = tk.Frame(notebook, bg='DodgerBlue4')
+
+    notebook.add(tab1, text="Resampling")
+    notebook.add(tab2, text="FLAC Conversion")
+    notebook.add(tab3, text="WAV Conversion")
+
+    # Shared header: Logo and title in each tab
+    def create_tab_header(parent):
+        # Create a frame for the header inside the parent tab
+        header_frame = tk.Frame(parent, bg='DodgerBlue4')
+        header_frame.pack(side=tk.TOP, anchor='nw', pady=10, padx=10, fill=tk.X)
+
+        # Load the company logo image
+        logo_image = Image.open("white_square_OSA_med.jpg")
+        logo_image = logo_image.resize((100, 100), Image.LANCZOS)
+        logo_photo = ImageTk.PhotoImage(logo_image)
+
+        # Display the company logo
+        logo_label = tk.Label(header_frame, image=logo_photo, bg='DodgerBlue4')
+        logo_label.image = logo_photo  # Keep reference to avoid garbage collection
+        logo_label.pack(side=tk.LEFT)
+
+        # Add a label for "EZ Decimator" next to the logo
+        ez_decimator_label = tk.Label(
+            header_frame, text="EZ AudioMate", bg='DodgerBlue4', fg='white',
+            font=("Times New Roman", 24, "bold")
+        )
+        ez_decimator_label.pack(side=tk.LEFT, padx=10)
+
+    # Add the shared header to each tab
+    create_tab_header(tab1)
+    create_tab_header(tab2)
+    create_tab_header(tab3)
+
+    ##########################################################################
+    #       GUI --> TAB 1 = VARIABLES, HELP BUTTON, AND BOARDER
+    ##########################################################################
+
+    # Tab 1: Resampling UI
+    input_folder_var = tk.StringVar()
+    output_folder_var = tk.StringVar()
+    include_sr_in_filename_var = tk.IntVar()
+    streaming_mode_var = tk.IntVar()
+    quality_var = tk.StringVar(value='balanced')
+    skip_done_var = tk.IntVar(value=1)
+    recursive_var = tk.IntVar()
+    pipeline_var = tk.IntVar()
+    subtype_var = tk.StringVar(value='source')
+    dither_var = tk.IntVar()
+    num_workers_var = tk.StringVar(value=str(os.cpu_count() or 1))
+    start_time_var = tk.StringVar()
+    end_time_var = tk.StringVar()
+    segment_var = tk.StringVar()
+    channels_var = tk.StringVar(value=core.DEFAULT_CHANNELS)
+    skip_same_rate_var = tk.IntVar()
+    check_first_var = tk.IntVar()
+
+    # Add help button function and placement on tab1
+    help_button_tab1 = tk.Button(tab1, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help)
+    help_button_tab1.pack(padx=10, pady=10)
+    help_button_tab1.place(relx=0.95, rely=0.06, anchor=tk.NE)
+
+    # Add a canvas to draw the border around the widgets
+    canvas_border1= tk.Canvas(tab1, bg='DodgerBlue4', highlightthickness=0)
+    canvas_border1.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
+    # Draw the initial border
+    canvas_border1.create_rectangle(10, 10, 685, 385, outline="white", width=2)
+
+
+    ##########################################################################
+    #       GUI --> TAB 1 = WIDGETS AND INPUTS
+    ##########################################################################
+
+    # Input folder selection
+    input_folder_label = tk.Label(tab1, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    input_folder_label.pack(pady=5)
+    input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
+    input_folder_entry = tk.Entry(tab1, textvariable=input_folder_var, width=40)
+    input_folder_entry.pack(pady=5)
+    input_folder_entry.place(relx=0.3, rely=0.32, anchor=tk.CENTER)
+    browse_input_button = tk.Button(tab1, text="Browse", command=browse_input_folder, font=("Times New Roman", 12), bd=0, width=18)
+    browse_input_button.pack(pady=5)
+    browse_input_button.place(relx=0.3, rely=0.37, anchor=tk.CENTER)
+    # Inventory of the input folder (read from the file headers)
+    inventory_button = tk.Button(tab1, text="Inventory", command=show_inventory, font=("Times New Roman", 12), bd=0, width=9)
+    inventory_button.pack(pady=5)
+    inventory_button.place(relx=0.47, rely=0.37, anchor=tk.CENTER)
+
+    # Output folder selection
+    output_folder_label = tk.Label(tab1, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    output_folder_label.pack(pady=5)
+    output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
+    output_folder_entry = tk.Entry(tab1, textvariable=output_folder_var, width=40)
+    output_folder_entry.pack(pady=5)
+    output_folder_entry.place(relx=0.3, rely=0.51, anchor=tk.CENTER)
+    browse_output_button = tk.Button(tab1, text="Browse", command=browse_output_folder, font=("Times New Roman", 12), bd=0, width=18)
+    browse_output_button.pack(pady=5)
+    browse_output_button.place(relx=0.3, rely=0.56, anchor=tk.CENTER)
+
+    # Desired sampling rate
+    desired_sr_label = tk.Label(tab1, text="Desired Sampling Rate(s) (Hz):", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    desired_sr_label.pack(pady=5)
+    desired_sr_label.place(relx=0.7, rely=0.28, anchor=tk.CENTER)
+    desired_sr_entry = tk.Entry(tab1, width=40)
+    desired_sr_entry.pack(pady=5)
+    desired_sr_entry.place(relx=0.7, rely=0.32, anchor=tk.CENTER)
+
+    # Checkbox for including desired sampling rate in the filename
+    include_sr_checkbox = tk.Checkbutton(tab1, text="Include Desired SR in Filename", variable=include_sr_in_filename_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    include_sr_checkbox.pack(pady=5)
+    include_sr_checkbox.place(relx=0.73, rely=0.51, anchor=tk.CENTER)
+
+    # Checkbox for resampling large files block by block instead of loading them into memory
+    streaming_mode_checkbox = tk.Checkbutton(tab1, text="Streaming Mode (Large Files)", variable=streaming_mode_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    streaming_mode_checkbox.pack(pady=5)
+    streaming_mode_checkbox.place(relx=0.73, rely=0.57, anchor=tk.CENTER)
+
+    # Checkbox for skipping files that were already processed with the same settings (resumes interrupted runs)
+    skip_done_checkbox = tk.Checkbutton(tab1, text="Skip Files Already Done", variable=skip_done_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    skip_done_checkbox.pack(pady=5)
+    skip_done_checkbox.place(relx=0.73, rely=0.63, anchor=tk.CENTER)
+
+    # Checkbox for taking the inventory of the input folder (and confirming it) before resampling
+    check_first_checkbox = tk.Checkbutton(tab1, text="Check First", variable=check_first_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    check_first_checkbox.pack(pady=5)
+    check_first_checkbox.place(relx=0.48, rely=0.57, anchor=tk.CENTER)
+
+    # Checkbox for leaving out the files that are already at a desired sampling rate
+    skip_same_rate_checkbox = tk.Checkbutton(tab1, text="Skip Same SR", variable=skip_same_rate_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    skip_same_rate_checkbox.pack(pady=5)
+    skip_same_rate_checkbox.place(relx=0.5, rely=0.63, anchor=tk.CENTER)
+
+    # Checkbox for also resampling the files in all subfolders
+    recursive_checkbox = tk.Checkbutton(tab1, text="Include Subfolders", variable=recursive_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    recursive_checkbox.pack(pady=5)
+    recursive_checkbox.place(relx=0.3, rely=0.63, anchor=tk.CENTER)
+
+    # Checkbox for reading the next files while the current ones are resampled and saved (network drives)
+    pipeline_checkbox = tk.Checkbutton(tab1, text="Prefetch Files (Network Drives)", variable=pipeline_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    pipeline_checkbox.pack(pady=5)
+    pipeline_checkbox.place(relx=0.73, rely=0.69, anchor=tk.CENTER)
+
+    # Sample format of the resampled files ('source' = same as the original) and dither when reducing the bit depth
+    subtype_label = tk.Label(tab1, text="Sample Format:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    subtype_label.pack(pady=5)
+    subtype_label.place(relx=0.15, rely=0.69, anchor=tk.CENTER)
+    subtype_menu = ttk.Combobox(tab1, textvariable=subtype_var, values=list(core.OUTPUT_SUBTYPES), state='readonly', width=10)
+    subtype_menu.pack(pady=5)
+    subtype_menu.place(relx=0.3, rely=0.69, anchor=tk.CENTER)
+    dither_checkbox = tk.Checkbutton(tab1, text="Dither", variable=dither_var, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    dither_checkbox.pack(pady=5)
+    dither_checkbox.place(relx=0.42, rely=0.69, anchor=tk.CENTER)
+
+    # Part of each file to resample (start and end times in seconds) and the length of the segments it is split into
+    start_time_label = tk.Label(tab1, text="Start (s):", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    start_time_label.pack(pady=5)
+    start_time_label.place(relx=0.1, rely=0.42, anchor=tk.CENTER)
+    start_time_entry = tk.Entry(tab1, textvariable=start_time_var, width=6)
+    start_time_entry.pack(pady=5)
+    start_time_entry.place(relx=0.18, rely=0.42, anchor=tk.CENTER)
+    end_time_label = tk.Label(tab1, text="End (s):", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    end_time_label.pack(pady=5)
+    end_time_label.place(relx=0.26, rely=0.42, anchor=tk.CENTER)
+    end_time_entry = tk.Entry(tab1, textvariable=end_time_var, width=6)
+    end_time_entry.pack(pady=5)
+    end_time_entry.place(relx=0.33, rely=0.42, anchor=tk.CENTER)
+    segment_label = tk.Label(tab1, text="Split (s):", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    segment_label.pack(pady=5)
+    segment_label.place(relx=0.41, rely=0.42, anchor=tk.CENTER)
+    segment_entry = tk.Entry(tab1, textvariable=segment_var, width=6)
+    segment_entry.pack(pady=5)
+    segment_entry.place(relx=0.49, rely=0.42, anchor=tk.CENTER)
+
+    # Channels of the resampled files: 'mono' (mix down), 'all', or the channel numbers to keep (e.g. 1, 3)
+    channels_label = tk.Label(tab1, text="Channels:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    channels_label.pack(pady=5)
+    channels_label.place(relx=0.1, rely=0.75, anchor=tk.CENTER)
+    channels_menu = ttk.Combobox(tab1, textvariable=channels_var, values=['mono', 'all'], width=8)
+    channels_menu.pack(pady=5)
+    channels_menu.place(relx=0.21, rely=0.75, anchor=tk.CENTER)
+
+    # Number of worker processes used for resampling
+    num_workers_label = tk.Label(tab1, text="Worker Processes:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    num_workers_label.pack(pady=5)
+    num_workers_label.place(relx=0.64, rely=0.39, anchor=tk.CENTER)
+    num_workers_spinbox = tk.Spinbox(tab1, from_=1, to=os.cpu_count() or 1, textvariable=num_workers_var, width=5)
+    num_workers_spinbox.pack(pady=5)
+    num_workers_spinbox.place(relx=0.78, rely=0.39, anchor=tk.CENTER)
+
+    # Quality preset for the resampling filter
+    quality_label = tk.Label(tab1, text="Quality:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    quality_label.pack(pady=5)
+    quality_label.place(relx=0.64, rely=0.45, anchor=tk.CENTER)
+    quality_menu = ttk.Combobox(tab1, textvariable=quality_var, values=list(core.QUALITY_PRESETS), state='readonly', width=10)
+    quality_menu.pack(pady=5)
+    quality_menu.place(relx=0.78, rely=0.45, anchor=tk.CENTER)
+
+    # Resample button
+    resample_button = tk.Button(tab1, text="Resample and Save", bg='light blue', fg='black', font=("Times New Roman", 16), command=process_files, width=20)
+    resample_button.pack(pady=20)
+    resample_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
+
+    # Cancel button (stops the running job after the files in progress)
+    cancel_button = tk.Button(tab1, text="Cancel", bg='gray', fg='white', font=("Times New Roman", 16), command=cancel_job, width=8)
+    cancel_button.pack(pady=20)
+    cancel_button.place(relx=0.82, rely=0.75, anchor=tk.CENTER)
+
+    # Progress bar and status label
+    progress = Progressbar(tab1, length=300, mode='determinate')
+    progress.pack(pady=5)
+    progress.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
+    label_status = tk.Label(tab1, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
+    label_status.pack(pady=5)
+    label_status.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
+
+    ##########################################################################
+    #       GUI --> TAB 2 = CONVERT TO FLAC
+    ##########################################################################
+
+    # Tab 2: Compress to FLAC
+    input_folder_var2 = tk.StringVar()
+    output_folder_var2 = tk.StringVar()
+    skip_done_var2 = tk.IntVar(value=1)
+    recursive_var2 = tk.IntVar()
+    pipeline_var2 = tk.IntVar()
+    subtype_var2 = tk.StringVar(value='source')
+    dither_var2 = tk.IntVar()
+    flac_level_var = tk.StringVar(value=str(core.DEFAULT_ENCODING['flac_level']))
+
+    help_button_tab2 = tk.Button(tab2, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help2)
+    help_button_tab2.pack(padx=10, pady=10)
+    help_button_tab2.place(relx=0.95, rely=0.06, anchor=tk.NE)
+
+    # Add a canvas to draw the border around the widgets
+    canvas_border2= tk.Canvas(tab2, bg='DodgerBlue4', highlightthickness=0)
+    canvas_border2.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
+    # Draw the initial border
+    canvas_border2.create_rectangle(10, 10, 685, 385, outline="white", width=2)
+
+    # Input folder selection
+    input_folder_label = tk.Label(tab2, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    input_folder_label.pack(pady=5)
+    input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
+    input_folder_entry = tk.Entry(tab2, textvariable=input_folder_var2, width=50)
+    input_folder_entry.pack(pady=5)
+    input_folder_entry.place(relx=0.6, rely=0.34, anchor=tk.CENTER)
+    browse_input_button = tk.Button(tab2, text="Browse", command=browse_input_folder2, font=("Times New Roman", 12), bd=0, width=16)
+    browse_input_button.pack(pady=5)
+    browse_input_button.place(relx=0.3, rely=0.34, anchor=tk.CENTER)
+
+    # Output folder selection
+    output_folder_label = tk.Label(tab2, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    output_folder_label.pack(pady=5)
+    output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
+    output_folder_entry = tk.Entry(tab2, textvariable=output_folder_var2, width=50)
+    output_folder_entry.pack(pady=5)
+    output_folder_entry.place(relx=0.6, rely=0.53, anchor=tk.CENTER)
+    browse_output_button = tk.Button(tab2, text="Browse", command=browse_output_folder2, font=("Times New Roman", 12), bd=0, width=16)
+    browse_output_button.pack(pady=5)
+    browse_output_button.place(relx=0.3, rely=0.53, anchor=tk.CENTER)
+
+    # Checkbox for skipping files that were already converted (resumes interrupted runs)
+    skip_done_checkbox = tk.Checkbutton(tab2, text="Skip Files Already Done", variable=skip_done_var2, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    skip_done_checkbox.pack(pady=5)
+    skip_done_checkbox.place(relx=0.35, rely=0.64, anchor=tk.CENTER)
+
+    # Checkbox for also converting the files in all subfolders
+    recursive_checkbox = tk.Checkbutton(tab2, text="Include Subfolders", variable=recursive_var2, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    recursive_checkbox.pack(pady=5)
+    recursive_checkbox.place(relx=0.65, rely=0.64, anchor=tk.CENTER)
+
+    # Checkbox for reading the next files while the current ones are converted and saved (network drives)
+    pipeline_checkbox = tk.Checkbutton(tab2, text="Prefetch Files (Network Drives)", variable=pipeline_var2, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    pipeline_checkbox.pack(pady=5)
+    pipeline_checkbox.place(relx=0.5, rely=0.69, anchor=tk.CENTER)
+
+    # Sample format of the converted files ('source' = same as the original) and dither when reducing the bit depth
+    subtype_label = tk.Label(tab2, text="Sample Format:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    subtype_label.pack(pady=5)
+    subtype_label.place(relx=0.2, rely=0.59, anchor=tk.CENTER)
+    subtype_menu = ttk.Combobox(tab2, textvariable=subtype_var2, values=list(core.OUTPUT_SUBTYPES), state='readonly', width=10)
+    subtype_menu.pack(pady=5)
+    subtype_menu.place(relx=0.35, rely=0.59, anchor=tk.CENTER)
+    dither_checkbox = tk.Checkbutton(tab2, text="Dither", variable=dither_var2, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    dither_checkbox.pack(pady=5)
+    dither_checkbox.place(relx=0.48, rely=0.59, anchor=tk.CENTER)
+
+    # FLAC compression level (0 = fastest to encode, 8 = smallest files)
+    flac_level_label = tk.Label(tab2, text="FLAC Level:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    flac_level_label.pack(pady=5)
+    flac_level_label.place(relx=0.64, rely=0.59, anchor=tk.CENTER)
+    flac_level_spinbox = tk.Spinbox(tab2, from_=0, to=8, textvariable=flac_level_var, width=5)
+    flac_level_spinbox.pack(pady=5)
+    flac_level_spinbox.place(relx=0.75, rely=0.59, anchor=tk.CENTER)
+
+    # Compress to  FLAC button
+    compress_button = tk.Button(tab2, text="Convert to FLAC", bg='light blue', fg='black', font=("Times New Roman", 16), command=compress_to_flac, width=20)
+    compress_button.pack(pady=20)
+    compress_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
+
+    # Cancel button (stops the running job after the files in progress)
+    cancel_button = tk.Button(tab2, text="Cancel", bg='gray', fg='white', font=("Times New Roman", 16), command=cancel_job, width=8)
+    cancel_button.pack(pady=20)
+    cancel_button.place(relx=0.82, rely=0.75, anchor=tk.CENTER)
+
+    # Progress bar and status label for Tab 2
+    progress_tab2 = Progressbar(tab2, length=300, mode='determinate')
+    progress_tab2.pack(pady=5)
+    progress_tab2.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
+
+    label_status_tab2 = tk.Label(tab2, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
+    label_status_tab2.pack(pady=5)
+    label_status_tab2.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
+
+    ##########################################################################
+    #       GUI --> TAB 3 = CONVERT TO WAV
+    ##########################################################################
+
+    # Tab 3: Convert to WAV
+    input_folder_var3= tk.StringVar()
+    output_folder_var3 = tk.StringVar()
+    skip_done_var3 = tk.IntVar(value=1)
+    recursive_var3 = tk.IntVar()
+    pipeline_var3 = tk.IntVar()
+    subtype_var3 = tk.StringVar(value='source')
+    dither_var3 = tk.IntVar()
+
+    help_button_tab3 = tk.Button(tab3, text="HELP", bg='gray', fg='white', font=("Times New Roman", 16), command=show_help3)
+    help_button_tab3.pack(padx=10, pady=10)
+    help_button_tab3.place(relx=0.95, rely=0.06, anchor=tk.NE)
+
+    # Add a canvas to draw the border around the widgets
+    canvas_border3= tk.Canvas(tab3, bg='DodgerBlue4', highlightthickness=0)
+    canvas_border3.place(relx=0.5, rely=0.55, anchor=tk.CENTER, width=695, height=395)
+    # Draw the initial border
+    canvas_border3.create_rectangle(10, 10, 685, 385, outline="white", width=2)
+
+    # Input folder selection
+    input_folder_label = tk.Label(tab3, text="Select Input Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    input_folder_label.pack(pady=5)
+    input_folder_label.place(relx=0.3, rely=0.28, anchor=tk.CENTER)
+    input_folder_entry = tk.Entry(tab3, textvariable=input_folder_var3, width=50)
+    input_folder_entry.pack(pady=5)
+    input_folder_entry.place(relx=0.6, rely=0.34, anchor=tk.CENTER)
+    browse_input_button = tk.Button(tab3, text="Browse", command=browse_input_folder3, font=("Times New Roman", 12), bd=0, width=16)
+    browse_input_button.pack(pady=5)
+    browse_input_button.place(relx=0.3, rely=0.34, anchor=tk.CENTER)
+
+    # Output folder selection
+    output_folder_label = tk.Label(tab3, text="Select Output Folder:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    output_folder_label.pack(pady=5)
+    output_folder_label.place(relx=0.3, rely=0.47, anchor=tk.CENTER)
+    output_folder_entry = tk.Entry(tab3, textvariable=output_folder_var3, width=50)
+    output_folder_entry.pack(pady=5)
+    output_folder_entry.place(relx=0.6, rely=0.53, anchor=tk.CENTER)
+    browse_output_button = tk.Button(tab3, text="Browse", command=browse_output_folder3, font=("Times New Roman", 12), bd=0, width=16)
+    browse_output_button.pack(pady=5)
+    browse_output_button.place(relx=0.3, rely=0.53, anchor=tk.CENTER)
+
+    # Checkbox for skipping files that were already converted (resumes interrupted runs)
+    skip_done_checkbox = tk.Checkbutton(tab3, text="Skip Files Already Done", variable=skip_done_var3, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    skip_done_checkbox.pack(pady=5)
+    skip_done_checkbox.place(relx=0.35, rely=0.64, anchor=tk.CENTER)
+
+    # Checkbox for also converting the files in all subfolders
+    recursive_checkbox = tk.Checkbutton(tab3, text="Include Subfolders", variable=recursive_var3, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    recursive_checkbox.pack(pady=5)
+    recursive_checkbox.place(relx=0.65, rely=0.64, anchor=tk.CENTER)
+
+    # Checkbox for reading the next files while the current ones are converted and saved (network drives)
+    pipeline_checkbox = tk.Checkbutton(tab3, text="Prefetch Files (Network Drives)", variable=pipeline_var3, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    pipeline_checkbox.pack(pady=5)
+    pipeline_checkbox.place(relx=0.5, rely=0.69, anchor=tk.CENTER)
+
+    # Sample format of the converted files ('source' = same as the original) and dither when reducing the bit depth
+    subtype_label = tk.Label(tab3, text="Sample Format:", bg='DodgerBlue4', fg='white', font=("Times New Roman", 16))
+    subtype_label.pack(pady=5)
+    subtype_label.place(relx=0.2, rely=0.59, anchor=tk.CENTER)
+    subtype_menu = ttk.Combobox(tab3, textvariable=subtype_var3, values=list(core.OUTPUT_SUBTYPES), state='readonly', width=10)
+    subtype_menu.pack(pady=5)
+    subtype_menu.place(relx=0.35, rely=0.59, anchor=tk.CENTER)
+    dither_checkbox = tk.Checkbutton(tab3, text="Dither", variable=dither_var3, bg='DodgerBlue4', fg='white', font=("Times New Roman", 16), selectcolor='DodgerBlue4')
+    dither_checkbox.pack(pady=5)
+    dither_checkbox.place(relx=0.48, rely=0.59, anchor=tk.CENTER)
+
+    # Convert to WAV button
+    compress_button = tk.Button(tab3, text="Convert to WAV", bg='light blue', fg='black', font=("Times New Roman", 16), command=convert_to_wav, width=20)
+    compress_button.pack(pady=20)
+    compress_button.place(relx=0.5, rely=0.75, anchor=tk.CENTER)
+
+    # Cancel button (stops the running job after the files in progress)
+    cancel_button = tk.Button(tab3, text="Cancel", bg='gray', fg='white', font=("Times New Roman", 16), command=cancel_job, width=8)
+    cancel_button.pack(pady=20)
+    cancel_button.place(relx=0.82, rely=0.75, anchor=tk.CENTER)
+
+    # Progress bar and status label for Tab 3
+    progress_tab3 = Progressbar(tab3, length=300, mode='determinate')
+    progress_tab3.pack(pady=5)
+    progress_tab3.place(relx=0.5, rely=0.81, anchor=tk.CENTER)
+
+    label_status_tab3 = tk.Label(tab3, text='', bg='DodgerBlue4', fg='white', font=("Times New Roman", 12))
+    label_status_tab3.pack(pady=5)
+    label_status_tab3.place(relx=0.5, rely=0.85, anchor=tk.CENTER)
+
+    # Start the main event loop
+    # Show the progress of the background jobs
+    root.after(EVENT_POLL_MS, drain_job_events)
+
+    root.mainloop()
+
+
@@ -0,0 +1,4 @@
+# EZ AudioMate processing package (no GUI): resampling and FLAC/WAV conversion of whole folders
+# Run "python -m audiomate --help" for the command line
+
+from .core import NoAudioFilesError, resample_folder, transcode_folder
@@ -0,0 +1,147 @@
+# Benchmark of the resampling and FLAC/WAV conversion paths on synthetic recordings
+# Run with "python -m audiomate bench" (see --help); results are saved as JSON so runs can be compared over time
+#
+# Each case runs in a fresh process so its peak memory is measured on its own. Reported for each case:
+#   seconds      = median wall time of the whole path for one file (process_file / convert_file)
+#   process_seconds = the same without hashing the input for the job manifest, which re-reads the whole file
+#   realtime     = seconds of audio processed per second (x real time), from process_seconds
+#   mb_per_s     = input file size processed per second, from process_seconds
+#   peak_rss_mb  = peak resident memory of the process running the case (which makes no other call)
+#   stages       = median time of each stage (decode, resample, encode and hashing the input for the job manifest), as
+#                  measured by process_file / convert_file themselves (see report.FileStats); encode includes writing
+#                  the outputs, as libsndfile encodes and writes in the same call
+# One untimed run of each case comes first so imports and library set-up are not counted
+
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import soundfile as sf
+from . import core
+
+# Sample formats for each bit depth of the synthetic recordings
+BIT_DEPTH_SUBTYPES = {16: 'PCM_16', 24: 'PCM_24', 32: 'FLOAT'}
+
+# Number of frames generated and written at a time (so long test recordings do not need to fit in memory)
+GENERATE_BLOCK_FRAMES = 1 << 20
+
+##########################################################################
+#       SYNTHETIC TEST RECORDINGS
+##########################################################################
+
+# Function to write a synthetic multichannel recording: low-level noise plus a different tone on each channel
+def make_test_recording(path, duration, sr, channels, bit_depth, seed=0):
+    rng = np.random.default_rng(seed)
+    total_frames = int(round(duration * sr))
+    freqs = np.linspace(0.01, 0.2, channels) * sr  # well inside every likely output band
+    with sf.SoundFile(path, 'w', samplerate=sr, channels=channels, subtype=BIT_DEPTH_SUBTYPES[bit_depth]) as f:
+        for start in range(0, total_frames, GENERATE_BLOCK_FRAMES):
+            t = np.arange(start, min(start + GENERATE_BLOCK_FRAMES, total_frames))[:, None] / sr
+            block = 0.3 * np.sin(2 * np.pi * freqs * t) + 0.05 * rng.standard_normal((len(t), channels))
+            f.write(block.astype(np.float32))
+    return path
+
+##########################################################################
+#       MEASUREMENTS
+##########################################################################
+
+# Function to get the peak resident memory of this process in bytes (None if it cannot be measured)
+def get_peak_rss():
+    try:
+        import resource
+    except ImportError:  # Windows: only available through psutil
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, kilobytes elsewhere
+
+# Function to time a call; returns (result, seconds)
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+# Function to run one benchmark case (in its own process) and return its measurements
+def run_case(case, input_path, work_dir, target_sr, quality, repeat):
+    input_folder, filename = os.path.split(input_path)
+    totals, process_totals, stages = [], [], []
+    for run in range(repeat + 1):
+        if case in ('resample', 'resample_streaming'):
+            (_, _, stats), seconds = timed(core.process_file, filename, [target_sr], input_folder, work_dir, True,
+                                           case == 'resample_streaming', quality)
+        else:
+            (_, _, stats), seconds = timed(core.convert_file, filename, input_folder, work_dir, case.upper())
+        if run > 0:  # the first run is a warm-up
+            totals.append(seconds)
+            process_totals.append(seconds - stats.stages.get('hash', 0.0))
+            stages.append(stats.stages)
+
+    return {
+        'seconds': statistics.median(totals),
+        'process_seconds': statistics.median(process_totals),
+        'stages': {stage: statistics.median(run.get(stage, 0.0) for run in stages) for stage in stages[0]},
+        'peak_rss_bytes': get_peak_rss(),
+    }
+
+##########################################################################
+#       BENCHMARK
+##########################################################################
+
+# Function to run the benchmark and save the results as JSON (progress is reported through log)
+def run_benchmark(duration=60.0, sr=96000, channels=4, bit_depth=24, target_sr=48000, quality='balanced',
+                  repeat=3, cases=('resample', 'resample_streaming', 'flac', 'wav'), output_path=None, log=print):
+    results = {
+        'started': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'platform': {'system': platform.platform(), 'python': platform.python_version(), 'cpu_count': os.cpu_count(),
+                     'numpy': np.__version__, 'soundfile': sf.__version__, 'libsndfile': sf.__libsndfile_version__},
+        'signal': {'duration_s': duration, 'sr': sr, 'channels': channels, 'bit_depth': bit_depth},
+        'settings': {'target_sr': target_sr, 'quality': quality, 'repeat': repeat},
+        'cases': {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix='audiomate_bench_') as work_dir:
+        log(f'Writing a {duration:g} s, {channels}-channel, {sr} Hz, {bit_depth}-bit test recording...')
+        wav_path = make_test_recording(os.path.join(work_dir, 'test.wav'), duration, sr, channels, bit_depth)
+        flac_path = os.path.join(work_dir, 'test.flac')
+        core.transcode_file(wav_path, flac_path, 'FLAC')
+
+        # A fresh "spawn" process per case, so the peak memory of one case does not carry over to the next
+        context = multiprocessing.get_context('spawn')
+        for case in cases:
+            input_path = flac_path if case == 'wav' else wav_path
+            case_dir = tempfile.mkdtemp(dir=work_dir)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                measurement = executor.submit(run_case, case, input_path, case_dir, target_sr, quality, repeat).result()
+
+            input_mb = os.path.getsize(input_path) / 1e6
+            measurement.update({
+                'input_mb': input_mb,
+                'realtime': duration / measurement['process_seconds'],
+                'mb_per_s': input_mb / measurement['process_seconds'],
+                'peak_rss_mb': measurement.pop('peak_rss_bytes') / 1e6 if measurement['peak_rss_bytes'] else None,
+            })
+            results['cases'][case] = measurement
+            log(format_case(case, measurement))
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        log(f'Results saved to {output_path}')
+    return results
+
+# Function to describe one case on a single line
+def format_case(case, measurement):
+    rss = f"{measurement['peak_rss_mb']:.0f} MB" if measurement['peak_rss_mb'] is not None else 'n/a'
+    stages = ', '.join(f'{stage} {seconds:.3f} s' for stage, seconds in measurement['stages'].items())
+    return (f"{case:<20} {measurement['seconds']:8.3f} s ({measurement['process_seconds']:.3f} s without hash)  "
+            f"{measurement['realtime']:8.1f}x real time  "
+            f"{measurement['mb_per_s']:8.1f} MB/s  peak RSS {rss}" + (f"  [{stages}]" if stages else ''))
@@ -0,0 +1,270 @@
+# Command line for EZ AudioMate, for batch jobs on headless machines (cron, SLURM, ...)
+# Examples:
+#   python -m audiomate resample /data/in /data/out --sr 48000 --include-sr --workers 8
+#   python -m audiomate resample /data/in /data/out --sr 48000 16000 2000
+#   python -m audiomate resample /data/in /data/out --sr 48000 --start 7200 --end 10800 --segment 600
+#   python -m audiomate resample /data/hydrophones /data/out --sr 48000 --channels 1 3
+#   python -m audiomate resample /data/in /data/out --sr 48000 -r --inventory-only
+#   python -m audiomate resample /data/in /data/out --sr 48000 -r --inventory --skip-same-rate
+#   python -m audiomate flac /data/wav /data/flac
+#   python -m audiomate flac /data/wav /data/flac --subtype PCM_16 --dither --flac-level 8
+#   python -m audiomate flac /mnt/nas/wav /data/flac --pipeline --readers 4
+#   python -m audiomate wav /data/flac /data/wav
+#   python -m audiomate resample /mnt/nas/season /mnt/nas/season_48k --sr 48000 -r --queue   (coordinator)
+#   python -m audiomate worker /mnt/nas/season_48k --workers 8                               (on each machine)
+#   python -m audiomate status /mnt/nas/season_48k
+#   python -m audiomate bench --duration 600 --sr 384000 --channels 4 --target-sr 48000
+
+import argparse
+import os
+import sys
+import time
+from . import core, workqueue
+from .inventory import INVENTORY_THREADS, take_inventory
+
+##########################################################################
+#       ARGUMENTS
+##########################################################################
+
+# Function to add the options of the threaded file pipeline to a sub-command
+def add_pipeline_arguments(subparser):
+    subparser.add_argument("--pipeline", action="store_true",
+                           help="read, process and write files in overlapping threads (for network storage)")
+    subparser.add_argument("--readers", type=int, default=2, help="reader threads with --pipeline")
+    subparser.add_argument("--writers", type=int, default=2, help="writer threads with --pipeline")
+    subparser.add_argument("--read-ahead", type=int, default=2, help="decoded files waiting to be processed")
+    subparser.add_argument("--write-behind", type=int, default=2, help="processed files waiting to be written")
+
+# Function to build the argument parser with one sub-command per job
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m audiomate", description="EZ AudioMate batch processing (no GUI).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    resample = subparsers.add_parser("resample", help="resample the audio files in a folder")
+    resample.add_argument("input_folder")
+    resample.add_argument("output_folder")
+    resample.add_argument("--sr", type=int, nargs="+", required=True,
+                          help="desired sampling rate(s) (Hz); with several rates each file is decoded once")
+    resample.add_argument("--include-sr", action="store_true", help="add _<sr>Hz to the output filenames")
+    resample.add_argument("--streaming", action="store_true", help="resample block by block (for very large files)")
+    resample.add_argument("--quality", choices=list(core.QUALITY_PRESETS), default="balanced")
+    resample.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes (DSP threads with --pipeline)")
+    resample.add_argument("--channels", nargs="+", default=[core.DEFAULT_CHANNELS],
+                          help="'mono' (mix down, the default), 'all' (keep every channel) or the channel numbers to keep")
+    resample.add_argument("--start", type=float, default=0.0, help="only resample from this time in each file (s)")
+    resample.add_argument("--end", type=float, help="only resample up to this time in each file (s)")
+    resample.add_argument("--segment", type=float,
+                          help="split the outputs into segments of this length (s), named after their start time")
+    resample.add_argument("--skip-same-rate", action="store_true",
+                          help="do not resample files to a rate they already have (they are not copied either)")
+
+    for command, output_format in (("flac", "FLAC"), ("wav", "WAV")):
+        convert = subparsers.add_parser(command, help=f"convert the audio files in a folder to {output_format}")
+        convert.add_argument("input_folder")
+        convert.add_argument("output_folder")
+
+    for command, subparser in subparsers.choices.items():
+        subparser.add_argument("--subtype", choices=list(core.OUTPUT_SUBTYPES), default="source",
+                               help="output sample format (default: the same as the input file)")
+        subparser.add_argument("--dither", action="store_true", help="add TPDF dither when samples are requantized")
+        if command != "wav":
+            subparser.add_argument("--flac-level", type=int, choices=list(core.FLAC_LEVELS), default=5,
+                                   help="FLAC compression level (0 = fastest, 8 = smallest; FLAC outputs only)")
+        subparser.add_argument("-r", "--recursive", action="store_true",
+                               help="also process the subfolders (the output folder mirrors the input folder)")
+        subparser.add_argument("--no-skip", action="store_true", help="reprocess files that are already done")
+        subparser.add_argument("--quiet", action="store_true", help="only print errors")
+        subparser.add_argument("--no-report", action="store_true",
+                               help="do not save the run report (JSON + CSV) in <output folder>/ezaudiomate_reports")
+        add_pipeline_arguments(subparser)
+        subparser.add_argument("--inventory", action="store_true",
+                               help="read the headers of all the files first and print a summary (duration, rates, "
+                                    "channels, expected output size); the progress is then weighted by duration")
+        subparser.add_argument("--inventory-only", action="store_true",
+                               help="only print the inventory summary, without processing anything")
+        subparser.add_argument("--inventory-threads", type=int, default=INVENTORY_THREADS,
+                               help="threads reading headers for the inventory")
+        subparser.add_argument("--queue", action="store_true",
+                               help="only create a work queue in the output folder, for 'worker' processes on any "
+                                    "number of machines")
+        subparser.add_argument("--lease-size", type=int, default=workqueue.LEASE_SIZE, help="files per lease with --queue")
+        subparser.add_argument("--lease-timeout", type=float, default=workqueue.LEASE_TIMEOUT,
+                               help="seconds after which the lease of a worker that stopped is given to another one")
+        subparser.add_argument("--replace-queue", action="store_true", help="replace an existing work queue")
+
+    worker = subparsers.add_parser("worker", help="process the leases of a work queue until it is empty")
+    worker.add_argument("output_folder", help="output folder of the job (where the queue was created)")
+    worker.add_argument("--input-folder", help="input folder of the job, if this machine mounts it somewhere else")
+    worker.add_argument("--worker-id", help="name of this worker (default: host name and process id)")
+    worker.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes for resampling (DSP threads with --pipeline)")
+    worker.add_argument("--poll", type=float, default=workqueue.POLL_INTERVAL,
+                        help="seconds between checks when the other workers hold the remaining leases")
+    worker.add_argument("--quiet", action="store_true", help="only print errors")
+    worker.add_argument("--no-report", action="store_true", help="do not save the report of this worker")
+    add_pipeline_arguments(worker)
+
+    status = subparsers.add_parser("status", help="show the progress of a work queue")
+    status.add_argument("output_folder")
+
+    bench = subparsers.add_parser("bench", help="benchmark resampling and conversion on a synthetic recording")
+    bench.add_argument("--duration", type=float, default=60.0, help="length of the test recording (s)")
+    bench.add_argument("--sr", type=int, default=96000, help="sampling rate of the test recording (Hz)")
+    bench.add_argument("--channels", type=int, default=4)
+    bench.add_argument("--bit-depth", type=int, choices=[16, 24, 32], default=24, help="32 = float")
+    bench.add_argument("--target-sr", type=int, default=48000, help="sampling rate to resample to (Hz)")
+    bench.add_argument("--quality", choices=list(core.QUALITY_PRESETS), default="balanced")
+    bench.add_argument("--repeat", type=int, default=3, help="runs per case (the median is reported)")
+    bench.add_argument("--cases", nargs="+", choices=["resample", "resample_streaming", "flac", "wav"],
+                       default=["resample", "resample_streaming", "flac", "wav"])
+    bench.add_argument("--output", default=f"audiomate_bench_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                       help="JSON file for the results")
+    return parser
+
+##########################################################################
+#       MAIN
+##########################################################################
+
+# Function to run a job from the command line; returns the exit code
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        from . import bench
+        bench.run_benchmark(duration=args.duration, sr=args.sr, channels=args.channels, bit_depth=args.bit_depth,
+                            target_sr=args.target_sr, quality=args.quality, repeat=max(1, args.repeat),
+                            cases=args.cases, output_path=args.output)
+        return 0
+
+    if args.command == "status":
+        return show_status(args.output_folder)
+
+    # Print one line per finished file, with the throughput so far and the time left
+    def update(idx, total_files, filename, report):
+        if not args.quiet:
+            print(f'Processing: {filename} ({idx}/{total_files}) - {report.get_progress_text(idx, total_files)}', flush=True)
+
+    # Settings of this machine (a distributed job can use different ones on each machine)
+    options = dict(pipeline=args.pipeline, readers=max(1, args.readers), writers=max(1, args.writers),
+                   read_ahead=max(1, args.read_ahead), write_behind=max(1, args.write_behind))
+    if args.command in ("resample", "worker"):
+        options['num_workers'] = max(1, args.workers)
+
+    if args.command == "worker":
+        return run_worker(args, update, options)
+
+    # Settings of the job
+    settings = dict(skip_done=not args.no_skip,
+                    encoding=core.get_encoding(args.subtype, args.dither, getattr(args, "flac_level", 5)))
+    if args.command == "resample":
+        try:
+            core.get_target_rates(args.sr)
+            window = core.get_time_window(args.start, args.end, args.segment)
+            channels = core.get_channels(" ".join(args.channels))
+        except ValueError as e:
+            parser.error(str(e))
+        settings.update(desired_sr=args.sr, include_sr=args.include_sr, streaming=args.streaming, quality=args.quality,
+                        window=window, channels=channels, skip_same_rate=args.skip_same_rate)
+
+    # Header-only inventory of the input folder, summed up before anything is processed
+    inventory = None
+    if args.inventory or args.inventory_only:
+        inventory = get_inventory(args, settings)
+        if args.inventory_only:
+            return 0
+
+    try:
+        if args.queue:
+            return create_queue(args, settings)
+        if args.command == "resample":
+            summary = core.resample_folder(args.input_folder, args.output_folder, recursive=args.recursive,
+                                           progress_callback=update, save_report=not args.no_report,
+                                           inventory=inventory, **settings, **options)
+        else:
+            summary = core.transcode_folder(args.input_folder, args.output_folder, args.command.upper(),
+                                            recursive=args.recursive, progress_callback=update,
+                                            save_report=not args.no_report, inventory=inventory, **settings, **options)
+    except core.NoAudioFilesError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"Done: {summary['processed']} file(s) processed, {summary['skipped']} already up to date.")
+        print(summary['report'].get_summary_text())
+        if summary['report_path']:
+            print(f"Report saved to {summary['report_path']} (per-file CSV next to it)")
+    return 0
+
+##########################################################################
+#       INVENTORY
+##########################################################################
+
+# Function to take the inventory of the input folder of a job and print its summary; returns the inventory
+def get_inventory(args, settings):
+    if args.command == "resample":
+        extensions = core.RESAMPLE_EXTENSIONS
+    else:
+        extensions = core.TRANSCODE_EXTENSIONS[args.command.upper()]
+    inventory = take_inventory(args.input_folder, extensions, args.recursive, args.output_folder,
+                               num_threads=args.inventory_threads)
+    if args.command == "resample":
+        print(inventory.get_summary_text(settings['desired_sr'], settings['window'], settings['channels'],
+                                         settings['encoding'], settings['skip_same_rate']), flush=True)
+    else:
+        print(inventory.get_summary_text(), flush=True)
+    return inventory
+
+##########################################################################
+#       DISTRIBUTED JOBS (WORK QUEUE)
+##########################################################################
+
+# Function to create the work queue of a job (coordinator); returns the exit code
+def create_queue(args, settings):
+    try:
+        queued = workqueue.create_work_queue(args.input_folder, args.output_folder, args.command, settings,
+                                             recursive=args.recursive, lease_size=args.lease_size,
+                                             lease_timeout=args.lease_timeout, replace=args.replace_queue)
+    except workqueue.WorkQueueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Queued {queued['files']} file(s) in {queued['leases']} lease(s). Start the workers with:")
+    print(f'  python -m audiomate worker "{os.path.abspath(args.output_folder)}"')
+    return 0
+
+# Function to run a worker of a distributed job until the queue is empty; returns the exit code
+def run_worker(args, update, options):
+    try:
+        summary = workqueue.run_worker(args.output_folder, worker_id=args.worker_id, input_folder=args.input_folder,
+                                       progress_callback=update, save_report=not args.no_report,
+                                       poll_interval=args.poll, **options)
+    except workqueue.WorkQueueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        print(f"Done: {summary['leases']} lease(s), {summary['processed']} file(s) processed, "
+              f"{summary['skipped']} already up to date.")
+        print(summary['report'].get_summary_text())
+        if summary['report_path']:
+            print(f"Report saved to {summary['report_path']} (per-file CSV next to it)")
+    if summary['failed_leases']:
+        print(f"{summary['failed_leases']} lease(s) failed on this worker; run 'status' for the errors", file=sys.stderr)
+        return 1
+    return 0
+
+# Function to print the progress of a work queue and the errors of its failed leases; returns the exit code
+def show_status(output_folder):
+    try:
+        queue = workqueue.WorkQueue(output_folder)
+    except workqueue.WorkQueueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    status = queue.get_status()
+    print(f"{queue.job['job']} job created {queue.job['created']}: {queue.job['files']} file(s) in {queue.job['leases']} lease(s)")
+    print(f"{status['pending']} pending, {status['leases']} in progress, {status['done']} done, {status['failed']} failed")
+    for lease_id, lease in queue.get_failed_leases().items():
+        print(f"{lease_id} ({len(lease['files'])} file(s), first {lease['files'][0]}):")
+        for error in lease['errors']:
+            print(f"  {error}")
+    return 0
@@ -0,0 +1,1006 @@
+# GUI-free processing core of EZ AudioMate: resampling, FLAC/WAV conversion and the job manifest
+# Used by the GUI ("EZ AudioMate.py") and the command line (python -m audiomate)
+# NOTE: nothing in this module may import tkinter or PIL, so it can run on headless machines
+
+import os
+import math
+import hashlib
+import json
+import socket
+import time
+import functools
+import multiprocessing
+import zlib
+import threading
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+import numpy as np
+import soundfile as sf
+import soxr
+from .pipeline import run_pipeline
+from .report import FileStats, RunReport, time_stage
+from .scanner import FileList, FolderScanner
+from .wavmap import open_wav_map
+
+##########################################################################
+#       INPUT FILE TYPES AND OUTPUT FILE NAMES
+##########################################################################
+
+# File extensions picked up by each job
+RESAMPLE_EXTENSIONS = (".wav", ".aif", ".flac")
+TRANSCODE_EXTENSIONS = {
+    'FLAC': (".wav", ".aif"),
+    'WAV': (".flac",),
+}
+
+# Raised when an input folder has no files for a job
+class NoAudioFilesError(Exception):
+    pass
+
+# Function to get the output filename, with the desired sampling rate added if requested
+# (filename can include subfolders, which are kept so the output folder mirrors the input folder)
+def get_output_filename(filename, desired_sr, include_sr):
+    if include_sr:
+        base, ext = os.path.splitext(filename)
+        return f"{base}_{desired_sr}Hz{ext}"
+    else:
+        return filename
+
+##########################################################################
+#       OUTPUT SAMPLE FORMAT, DITHER AND FLAC COMPRESSION
+##########################################################################
+
+# Sample formats that can be chosen for the outputs ('source' = the sample format of the input file)
+OUTPUT_SUBTYPES = ('source', 'PCM_16', 'PCM_24', 'FLOAT')
+
+# FLAC compression levels: 0 = fastest to encode, 8 = smallest files (5 is the FLAC default)
+FLAC_LEVELS = range(9)
+
+# Encoding settings used when none are given
+DEFAULT_ENCODING = {'subtype': 'source', 'dither': False, 'flac_level': 5}
+
+# Bits per sample of the integer sample formats
+SUBTYPE_BITS = {'PCM_S8': 8, 'PCM_U8': 8, 'PCM_16': 16, 'PCM_24': 24, 'PCM_32': 32}
+
+# Function to check and collect the encoding settings of a job: output sample format, TPDF dither when the
+# samples are requantized, and FLAC compression level
+def get_encoding(subtype='source', dither=False, flac_level=DEFAULT_ENCODING['flac_level']):
+    if subtype not in OUTPUT_SUBTYPES:
+        raise ValueError(f"Unknown sample format {subtype!r} (choose from {', '.join(OUTPUT_SUBTYPES)})")
+    if int(flac_level) not in FLAC_LEVELS:
+        raise ValueError("The FLAC compression level must be between 0 and 8")
+    return {'subtype': subtype, 'dither': bool(dither), 'flac_level': int(flac_level)}
+
+# Function to pick the sample format of an output file from the encoding settings and the input's sample format
+# (falls back like get_transcode_subtype when the output format cannot store it, e.g. FLOAT in a FLAC file)
+def get_output_subtype(encoding, source_subtype, output_format):
+    subtype = source_subtype if encoding['subtype'] == 'source' else encoding['subtype']
+    return get_transcode_subtype(subtype, output_format)
+
+# Function to check if writing samples of one sample format to another loses precision
+# (resampled samples are always float, so they are requantized by every integer output format)
+def is_requantized(source_subtype, subtype):
+    bits = SUBTYPE_BITS.get(subtype)
+    if bits is None:
+        return False  # float output
+    source_bits = SUBTYPE_BITS.get(source_subtype)
+    return source_bits is None or source_bits > bits
+
+# Function to get the extra arguments for writing an output file (the compression level of FLAC files)
+def get_write_options(encoding, output_format):
+    if output_format == 'FLAC':
+        return {'compression_level': encoding['flac_level'] / 8}  # soundfile takes 0-1 and maps it to FLAC levels 0-8
+    return {}
+
+# Function to get the random numbers used to dither an output file (seeded from the file name, so reruns write
+# the same files)
+def get_dither_rng(output_path):
+    return np.random.default_rng(zlib.crc32(os.path.basename(output_path).encode()))
+
+# Function to add TPDF (triangular) dither of +-1 LSB of the output sample format to float samples before they are
+# requantized, so the rounding error becomes a steady noise floor instead of distortion that follows the signal
+def add_dither(y, subtype, rng):
+    bits = SUBTYPE_BITS[subtype]
+    lsb = 2.0 ** (1 - bits)
+    y = np.asarray(y, dtype=np.float64 if bits > 16 else np.float32)  # float32 cannot hold 24-bit steps near full scale
+    # Both random values of each sample are drawn together, so a file dithered block by block gets the same noise
+    uniform = rng.random(y.shape + (2,), dtype=y.dtype)
+    noise = (uniform[..., 0] - uniform[..., 1]) * lsb
+    return np.clip(y + noise, -1.0, 1.0 - lsb)  # keep the dithered peaks inside the integer range
+
+##########################################################################
+#       TIME WINDOWS AND SEGMENTS
+##########################################################################
+
+# Time window used when none is given: whole files, each resampled to one output file per rate
+DEFAULT_WINDOW = {'start': 0.0, 'end': None, 'segment': None}
+
+# Function to check and collect the time window of a resampling job, in seconds: the part of each file to resample
+# (start to end; end=None = to the end of the file) and the length of the segments it is split into (None = not split)
+def get_time_window(start=0.0, end=None, segment=None):
+    start = float(start or 0)
+    end = None if end is None else float(end)
+    segment = None if segment is None else float(segment)
+    if start < 0:
+        raise ValueError("The start time cannot be negative")
+    if end is not None and end <= start:
+        raise ValueError("The end time must be after the start time")
+    if segment is not None and segment <= 0:
+        raise ValueError("The segment length must be more than 0 seconds")
+    return {'start': start, 'end': end, 'segment': segment}
+
+# Function to check if a time window covers whole files (the outputs then keep the names of get_output_filename)
+def is_whole_file(window):
+    return window == DEFAULT_WINDOW
+
+# Function to get the segments of a file (frames long at sr) in a time window, as (first frame, end frame) pairs
+# The last segment ends with the window (or the file) so it can be shorter; none if the file ends before the window
+def get_segments(frames, sr, window):
+    start = min(round(window['start'] * sr), frames)
+    stop = frames if window['end'] is None else min(round(window['end'] * sr), frames)
+    if window['segment'] is None:
+        return [(start, stop)] if start < stop else []
+    segment_frames = max(1, round(window['segment'] * sr))
+    return [(first, min(first + segment_frames, stop)) for first in range(start, stop, segment_frames)]
+
+# Function to get the output filename of a segment: the output filename of its rate (get_output_filename) with the
+# time the segment starts at in the input file, e.g. rec_48000Hz_000600s.wav (10 minutes in)
+def get_segment_filename(filename, desired_sr, include_sr, start_seconds):
+    base, ext = os.path.splitext(get_output_filename(filename, desired_sr, include_sr))
+    if float(start_seconds).is_integer():
+        return f"{base}_{int(start_seconds):06d}s{ext}"
+    return f"{base}_{start_seconds:010.3f}s{ext}"
+
+# Function to get the output paths of the segments of a file at each desired rate ({rate: [path of each segment]}),
+# creating its output subfolder
+def get_segment_paths(filename, desired_srs, output_folder, include_sr, segments, sr):
+    os.makedirs(os.path.dirname(os.path.join(output_folder, filename)), exist_ok=True)
+    return {desired_sr: [os.path.join(output_folder, get_segment_filename(filename, desired_sr, include_sr, first / sr))
+                         for first, _ in segments]
+            for desired_sr in get_target_rates(desired_srs)}
+
+##########################################################################
+#       CHANNELS
+##########################################################################
+
+# Channel setting used when none is given: all channels mixed down to mono (like librosa.load)
+DEFAULT_CHANNELS = 'mono'
+
+# Function to check and collect the channel setting of a resampling job: 'mono' (mix all channels down to one),
+# 'all' (keep every channel) or the numbers of the channels to keep, in order (a list, or text such as "1, 3";
+# 1 = the first channel); raises ValueError for settings that cannot be used
+def get_channels(channels=DEFAULT_CHANNELS):
+    if isinstance(channels, str):
+        if channels.strip().lower() in ('mono', 'all'):
+            return channels.strip().lower()
+    try:
+        numbers = [int(channel) for channel in (channels.replace(',', ' ').split() if isinstance(channels, str) else channels)]
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown channel setting {channels!r} (use 'mono', 'all' or channel numbers such as 1, 3)")
+    if not numbers or min(numbers) < 1 or len(set(numbers)) != len(numbers):
+        raise ValueError("Channel numbers start at 1 and each channel can only be given once")
+    return numbers
+
+# Function to get the indices of the channels of a file to read (None = all of them) for a channel setting
+def get_channel_indices(channels, num_channels, file_path):
+    if channels in ('mono', 'all'):
+        return None
+    if max(channels) > num_channels:
+        raise ValueError(f"{file_path} has {num_channels} channel(s), so channel {max(channels)} cannot be kept")
+    return [channel - 1 for channel in channels]
+
+##########################################################################
+#       RESAMPLE A FILE
+##########################################################################
+
+# Function to read one or several desired sampling rates (an int, a list, or text such as "48000, 16000")
+# Returns the distinct rates, highest first; raises ValueError if there are none or one is not a positive whole number
+def get_target_rates(desired_sr):
+    if isinstance(desired_sr, str):
+        desired_sr = [rate for rate in desired_sr.replace(',', ' ').split()]
+    elif not isinstance(desired_sr, (list, tuple)):
+        desired_sr = [desired_sr]
+    rates = sorted({int(rate) for rate in desired_sr}, reverse=True)
+    if not rates:
+        raise ValueError("no desired sampling rate given")
+    if rates[-1] <= 0:
+        raise ValueError(f"sampling rates must be positive, got {rates[-1]}")
+    return rates
+
+# Function to plan how a file is resampled to several rates: a list of (target rate, rate it is resampled from)
+# Each target is decimated from the lowest rate already produced that is an integer multiple of it
+# (e.g. 96 kHz -> 48 kHz -> 16 kHz -> 2 kHz), otherwise from the original signal
+def plan_fan_out(orig_sr, target_srs):
+    plan = []
+    for target_sr in sorted(set(target_srs), reverse=True):
+        sources = [sr for sr, _ in plan if sr > target_sr and sr % target_sr == 0 and sr <= orig_sr]
+        plan.append((target_sr, min(sources) if sources else orig_sr))
+    return plan
+
+# Function to get the output path of each desired rate of a file, creating its output subfolder
+def get_output_paths(filename, desired_srs, output_folder, include_sr):
+    os.makedirs(os.path.dirname(os.path.join(output_folder, filename)), exist_ok=True)
+    return {desired_sr: os.path.join(output_folder, get_output_filename(filename, desired_sr, include_sr))
+            for desired_sr in get_target_rates(desired_srs)}
+
+# Function to decode a file, or frames start to stop of it; returns (samples, sampling rate)
+# With channels='mono' (see get_channels) all channels are mixed down to one (1-D samples), otherwise the channels
+# are kept as a channels x frames array (like librosa.load with mono=False) so they are all resampled in one pass
+# Uncompressed WAV files are read through a memory map (same samples as librosa.load); mono float WAV files are then
+# not copied at all, unless in_memory is set to read them now (the pipeline's reader threads) rather than when used
+# Only the frames and channels asked for are read: soundfile seeks straight to the frames in other formats
+# The stage functions below record their times and sizes in stats (a report.FileStats) when one is given
+def load_file(file_path, stats=None, in_memory=False, start=0, stop=None, channels=DEFAULT_CHANNELS):
+    with time_stage(stats, 'decode'):
+        wav = open_wav_map(file_path)
+        if wav is None and start == 0 and stop is None and channels == 'mono':
+            import librosa  # slow to import, so only loaded when it is needed
+            y, sr = librosa.load(file_path, sr=None)
+        else:
+            if wav is not None:
+                indices = get_channel_indices(channels, wav.channels, file_path)
+                samples, sr = wav.read(start, stop, 'float32', indices), wav.samplerate
+            else:
+                samples, sr = sf.read(file_path, start=start, stop=stop, dtype='float32', always_2d=True)
+                indices = get_channel_indices(channels, samples.shape[1], file_path)
+                if indices is not None:
+                    samples = samples[:, indices]
+            if channels == 'mono':
+                y = samples.mean(axis=1, dtype=np.float32) if samples.shape[1] > 1 else samples[:, 0]
+            else:
+                y = np.ascontiguousarray(samples.T)
+            if in_memory and wav is not None and not y.flags.owndata:
+                y = np.array(y)
+    if stats is not None:
+        stats.sr, stats.frames_in = sr, y.shape[-1]
+    return y, sr
+
+# Function to resample decoded samples to one or several rates (following plan_fan_out); returns {rate: samples}
+def resample_to_rates(y, sr, desired_srs, quality='balanced', stats=None):
+    resampled = {sr: y}
+    with time_stage(stats, 'resample'):
+        for desired_sr, source_sr in plan_fan_out(sr, desired_srs):
+            resampled[desired_sr] = resample_audio(resampled[source_sr], source_sr, desired_sr, quality)
+    return {desired_sr: resampled[desired_sr] for desired_sr in desired_srs}
+
+# Function to write resampled samples to their output paths ({rate: samples} and {rate: path})
+# source_info (soundfile.info of the input) gives the output format and the 'source' sample format
+def save_resampled(resampled, output_paths, source_info, encoding=None, stats=None):
+    encoding = encoding or DEFAULT_ENCODING
+    subtype = get_output_subtype(encoding, source_info.subtype, source_info.format)
+    dither = encoding['dither'] and is_requantized('FLOAT', subtype)
+    for desired_sr, y in resampled.items():
+        with time_stage(stats, 'encode'):
+            y = y.T if y.ndim > 1 else y  # channels x frames -> frames x channels
+            if dither:
+                y = add_dither(y, subtype, get_dither_rng(output_paths[desired_sr]))
+            sf.write(output_paths[desired_sr], y, desired_sr, subtype=subtype, format=source_info.format,
+                     **get_write_options(encoding, source_info.format))
+        if stats is not None:
+            stats.add_output(output_paths[desired_sr], len(y))
+
+# Function to get the signature of an input file for the job manifest, timed as the 'hash' stage
+def sign_file(file_path, stats=None, content_hash=True):
+    with time_stage(stats, 'hash'):
+        return get_file_signature(file_path, content_hash)
+
+# Function to resample the segments of a time window of a file (see get_segments) to one or several rates
+# (segment_paths = {rate: [path of each segment]}); only the frames of the window are read
+# Split windows are always resampled block by block, as one stream cut at the segment boundaries, so the segments
+# join up without gaps and a whole day split in 10-minute segments is never held in memory
+def resample_window(file_path, segment_paths, segments, streaming=False, quality='balanced', stats=None, encoding=None,
+                    channels=DEFAULT_CHANNELS):
+    if not segments:
+        return
+    if streaming or len(segments) > 1:
+        resample_file_streaming(file_path, segment_paths, quality, stats=stats, encoding=encoding, segments=segments,
+                                channels=channels)
+        return
+    (first, end), = segments
+    output_paths = {desired_sr: paths[0] for desired_sr, paths in segment_paths.items()}
+    y, sr = load_file(file_path, stats, start=first, stop=end, channels=channels)
+    save_resampled(resample_to_rates(y, sr, output_paths, quality, stats), output_paths, sf.info(file_path), encoding,
+                   stats)
+
+# Function to resample a file to one or several rates, decoding it only once
+# With a time window (see get_time_window) only that part of the file is resampled, to one file per segment
+# channels (see get_channels) mixes the channels down to mono, or keeps all or some of them
+# NOTE: this runs inside the worker processes, so it only gets plain arguments
+# Returns (filename, signature of the input for the job manifest, report.FileStats of the file)
+def process_file(filename, desired_srs, input_folder, output_folder, include_sr, streaming=False, quality='balanced',
+                 encoding=None, window=None, channels=DEFAULT_CHANNELS):
+    file_path = os.path.join(input_folder, filename)
+    stats = FileStats(filename, file_path)
+
+    if window is not None and not is_whole_file(window):
+        info = sf.info(file_path)
+        segments = get_segments(info.frames, info.samplerate, window)
+        segment_paths = get_segment_paths(filename, desired_srs, output_folder, include_sr, segments, info.samplerate)
+        resample_window(file_path, segment_paths, segments, streaming, quality, stats, encoding, channels)
+        # Not hashed: that would read the whole file, when only the window was needed
+        return filename, sign_file(file_path, stats, content_hash=False), stats
+
+    output_paths = get_output_paths(filename, desired_srs, output_folder, include_sr)
+    if streaming:
+        resample_file_streaming(file_path, output_paths, quality, stats=stats, encoding=encoding, channels=channels)
+    else:
+        y, sr = load_file(file_path, stats, channels=channels)
+        save_resampled(resample_to_rates(y, sr, output_paths, quality, stats), output_paths, sf.info(file_path),
+                       encoding, stats)
+
+    # Hashed here so it is spread across the workers
+    return filename, sign_file(file_path, stats), stats
+
+##########################################################################
+#       RESAMPLING FILTERS (QUALITY PRESETS)
+##########################################################################
+
+# soxr quality recipe of each quality preset (res_type, as in librosa.resample)
+# Every preset keeps the passband flat (within 0.25 dB) to 90% of the new Nyquist frequency and starts its stopband at
+# the new Nyquist frequency, so nothing above it folds back into the output. Measured for tones 5% above the new Nyquist:
+#   fast     = soxr MQ  (aliases at -115 dB or lower)
+#   balanced = soxr HQ  (-130 dB or lower; the librosa.resample default, used before the presets existed)
+#   best     = soxr VHQ (-160 dB or lower, about twice as slow as balanced)
+QUALITY_PRESETS = {
+    'fast': {'res_type': 'soxr_mq'},
+    'balanced': {'res_type': 'soxr_hq'},
+    'best': {'res_type': 'soxr_vhq'},
+}
+
+# The filters are not cached between files or streams: soxr sets one up in about 0.1 ms, against 40-330 ms to resample
+# one minute of mono audio (96 kHz -> 48 kHz HQ up to 512 kHz -> 2 kHz VHQ)
+
+# Function to resample a signal with the soxr filter of a quality preset (time on the last axis, so several channels
+# are a channels x frames array); the same samples as librosa.resample with that res_type, without importing librosa
+# Like librosa.resample, the output is ceil(frames x target_sr / orig_sr) frames long
+def resample_audio(y, orig_sr, target_sr, quality='balanced'):
+    orig_sr, target_sr = int(orig_sr), int(target_sr)
+    if orig_sr == target_sr:
+        return y
+    frames_out = -(-y.shape[-1] * target_sr // orig_sr)
+    # soxr takes frames x channels, and resamples every channel with the same filter
+    y_hat = soxr.resample(np.ascontiguousarray(y.T), orig_sr, target_sr, QUALITY_PRESETS[quality]['res_type']).T
+    if y_hat.shape[-1] < frames_out:
+        padding = [(0, 0)] * (y_hat.ndim - 1) + [(0, frames_out - y_hat.shape[-1])]
+        y_hat = np.pad(y_hat, padding)
+    return y_hat[..., :frames_out]
+
+##########################################################################
+#       STREAMING (BLOCK-WISE) RESAMPLING FOR LARGE FILES
+##########################################################################
+
+# Number of input frames read from disk at a time in streaming mode
+STREAM_BLOCK_FRAMES = 65536
+
+# Resampler that keeps its filter state between blocks, so a file can be resampled in pieces
+# It runs soxr's streaming resampler with the filter of the quality preset (soxr gives the same samples block by block
+# as for the whole signal at once), and pads the end like librosa.resample, so the output matches whole-file mode
+class StreamingResampler:
+    def __init__(self, orig_sr, target_sr, channels, quality='balanced'):
+        self.orig_sr, self.target_sr = int(orig_sr), int(target_sr)
+        self.channels = channels
+        self.frames_in = 0   # input frames received so far
+        self.frames_out = 0  # output frames produced so far
+        if self.orig_sr != self.target_sr:
+            self.stream = soxr.ResampleStream(self.orig_sr, self.target_sr, channels, dtype='float32',
+                                              quality=QUALITY_PRESETS[quality]['res_type'])
+
+    # Function to resample the next block of input frames (shape = frames x channels)
+    def process(self, block):
+        block = np.ascontiguousarray(block, dtype=np.float32)
+        self.frames_in += len(block)
+        if self.orig_sr == self.target_sr:
+            self.frames_out += len(block)
+            return block
+        out = self.stream.resample_chunk(block)
+        self.frames_out += len(out)
+        return out
+
+    # Function to return the remaining output frames at the end of the file
+    # Like librosa.resample, the output is ceil(input frames x target_sr / orig_sr) frames long
+    def flush(self):
+        total_out = -(-self.frames_in * self.target_sr // self.orig_sr)
+        if self.orig_sr == self.target_sr:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        tail = self.stream.resample_chunk(np.zeros((0, self.channels), dtype=np.float32), last=True)
+        tail = tail[:max(0, total_out - self.frames_out)]
+        padding = np.zeros((max(0, total_out - self.frames_out - len(tail)), self.channels), dtype=np.float32)
+        self.frames_out = total_out
+        return np.concatenate([tail, padding])
+
+# Output stream of one rate written to consecutive files: frames go to each file in turn, moving on to the next one
+# at the boundaries (output frame numbers, counted from the start of the stream, where each file but the last ends)
+# open_file(path) opens an output file; with a dither subtype each file is dithered with its own sequence
+class SegmentedOutput:
+    def __init__(self, paths, boundaries, open_file, dither_subtype=None):
+        self.paths = paths
+        self.boundaries = list(boundaries) + [None]
+        self.open_file = open_file
+        self.dither_subtype = dither_subtype
+        self.frames = [0] * len(paths)  # frames written to each file
+        self.position = 0  # frames written to all the files
+        self.index = -1
+        self.file = None
+        self._next_file()
+
+    # Function to close the current file and open the next one
+    def _next_file(self):
+        self.close()
+        self.index += 1
+        self.file = self.open_file(self.paths[self.index])
+        self.rng = get_dither_rng(self.paths[self.index]) if self.dither_subtype else None
+
+    # Function to write a block of frames, split across files where it crosses a boundary
+    def write(self, block):
+        while len(block):
+            end = self.boundaries[self.index]
+            room = len(block) if end is None else end - self.position
+            if room <= 0:
+                self._next_file()
+                continue
+            piece, block = block[:room], block[room:]
+            self.file.write(add_dither(piece, self.dither_subtype, self.rng) if self.rng is not None else piece)
+            self.frames[self.index] += len(piece)
+            self.position += len(piece)
+
+    # Function to end the stream: files it did not reach (segments with no output frames) are still written, empty
+    def finish(self):
+        while self.index < len(self.paths) - 1:
+            self._next_file()
+        self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+# Function to resample a file block by block to one or several rates (output_paths = {rate: path}),
+# writing the outputs as it goes so memory use stays bounded (the stage times add up over the blocks)
+# With segments ([(first frame, end frame)] of a time window, see get_segments) only the frames of the window are
+# read, and each rate is written to one file per segment (output_paths = {rate: [path of each segment]})
+# channels works like in load_file: the kept channels are resampled together, as frames x channels blocks
+def resample_file_streaming(input_path, output_paths, quality='balanced', block_frames=STREAM_BLOCK_FRAMES, stats=None,
+                            encoding=None, segments=None, channels=DEFAULT_CHANNELS):
+    encoding = encoding or DEFAULT_ENCODING
+    info = sf.info(input_path)
+    orig_sr = info.samplerate
+    if segments is None:
+        segments, output_paths = [(0, info.frames)], {desired_sr: [path] for desired_sr, path in output_paths.items()}
+    first, stop = segments[0][0], segments[-1][1]
+    indices = get_channel_indices(channels, info.channels, input_path)
+    num_channels = 1 if channels == 'mono' else info.channels if indices is None else len(indices)
+    plan = plan_fan_out(orig_sr, output_paths)
+    resamplers = {desired_sr: StreamingResampler(source_sr, desired_sr, num_channels, quality)
+                  for desired_sr, source_sr in plan}
+    subtype = get_output_subtype(encoding, info.subtype, info.format)
+    # Each output file gets its own dither sequence, carried on from block to block
+    dither_subtype = subtype if encoding['dither'] and is_requantized('FLOAT', subtype) else None
+
+    # Function to open an output file of a rate
+    def open_file(desired_sr, path):
+        return sf.SoundFile(path, 'w', samplerate=desired_sr, channels=num_channels, subtype=subtype, format=info.format,
+                            **get_write_options(encoding, info.format))
+
+    with ExitStack() as stack:
+        outputs = {}
+        for desired_sr, _ in plan:
+            boundaries = [(start - first) * desired_sr // orig_sr for start, _ in segments[1:]]
+            outputs[desired_sr] = SegmentedOutput(output_paths[desired_sr], boundaries,
+                                                  functools.partial(open_file, desired_sr), dither_subtype)
+            stack.callback(outputs[desired_sr].close)
+        wav = open_wav_map(input_path)
+        if wav is not None:
+            input_blocks = wav.blocks(block_frames, 'float32', first, stop, indices)
+        else:
+            input_blocks = sf.blocks(input_path, blocksize=block_frames, dtype='float32', always_2d=True,
+                                     start=first, stop=stop)
+        while True:
+            with time_stage(stats, 'decode'):
+                block = next(input_blocks, None)
+                if block is None:
+                    break
+                if channels == 'mono':
+                    block = block.mean(axis=1, keepdims=True)  # downmix to mono to match librosa.load
+                elif indices is not None and wav is None:
+                    block = block[:, indices]
+                blocks = {orig_sr: block}
+            for desired_sr, source_sr in plan:
+                with time_stage(stats, 'resample'):
+                    blocks[desired_sr] = resamplers[desired_sr].process(blocks[source_sr])
+                with time_stage(stats, 'encode'):
+                    outputs[desired_sr].write(blocks[desired_sr])
+
+        # Flush in plan order, so the last frames of each rate are also passed on to the rates made from it
+        tails = {orig_sr: np.zeros((0, num_channels), dtype=np.float32)}
+        for desired_sr, source_sr in plan:
+            resampler = resamplers[desired_sr]
+            with time_stage(stats, 'resample'):
+                tails[desired_sr] = np.concatenate([resampler.process(tails[source_sr]), resampler.flush()])
+            with time_stage(stats, 'encode'):
+                outputs[desired_sr].write(tails[desired_sr])
+                outputs[desired_sr].finish()
+
+    if stats is not None:
+        stats.sr, stats.frames_in = orig_sr, resamplers[plan[0][0]].frames_in
+        for desired_sr, _ in plan:
+            for path, frames in zip(output_paths[desired_sr], outputs[desired_sr].frames):
+                stats.add_output(path, frames)
+
+##########################################################################
+#       LOSSLESS TRANSCODING (FLAC <-> WAV)
+##########################################################################
+
+# Number of frames copied at a time when transcoding
+TRANSCODE_BLOCK_FRAMES = 65536
+
+# Sample formats to use when the output format cannot store the original one (FLAC has no 32-bit or float samples)
+TRANSCODE_FALLBACK_SUBTYPES = {
+    'PCM_U8': 'PCM_S8',
+    'PCM_S8': 'PCM_U8',
+    'PCM_32': 'PCM_24',
+    'FLOAT': 'PCM_24',
+    'DOUBLE': 'PCM_24',
+}
+
+# Function to pick the output sample format, keeping the original bit depth whenever the output format allows it
+def get_transcode_subtype(subtype, output_format):
+    if sf.check_format(output_format, subtype):
+        return subtype
+    fallback = TRANSCODE_FALLBACK_SUBTYPES.get(subtype)
+    if fallback and sf.check_format(output_format, fallback):
+        return fallback
+    return sf.default_subtype(output_format)
+
+# Function to pick the numpy type that holds the samples without converting them to float
+def get_transcode_dtype(subtype):
+    if subtype in ('PCM_S8', 'PCM_U8', 'PCM_16'):
+        return 'int16'
+    if subtype in ('PCM_24', 'PCM_32'):
+        return 'int32'
+    if subtype == 'DOUBLE':
+        return 'float64'
+    return 'float32'
+
+# Function to pick the sample format and the numpy type for transcoding a file, and whether it is dithered
+# Samples are copied without converting them to float, unless they are requantized with dither
+def get_transcode_plan(input_subtype, output_format, encoding):
+    subtype = get_output_subtype(encoding, input_subtype, output_format)
+    dither = encoding['dither'] and is_requantized(input_subtype, subtype)
+    return subtype, 'float64' if dither else get_transcode_dtype(input_subtype), dither
+
+# Function to convert a file to another format block by block, keeping the sample rate, channels and text metadata
+# (title, artist, comment, ...) of the original, and its bit depth unless the encoding settings ask for another one
+# Uncompressed WAV inputs are read through a memory map: blocks in the file's own sample type go to the encoder
+# without being copied
+def transcode_file(input_path, output_path, output_format, block_frames=TRANSCODE_BLOCK_FRAMES, stats=None,
+                   encoding=None):
+    encoding = encoding or DEFAULT_ENCODING
+    with sf.SoundFile(input_path) as input_file:
+        subtype, dtype, dither = get_transcode_plan(input_file.subtype, output_format, encoding)
+        rng = get_dither_rng(output_path)
+        with sf.SoundFile(output_path, 'w', samplerate=input_file.samplerate, channels=input_file.channels,
+                          format=output_format, subtype=subtype, **get_write_options(encoding, output_format)) as output_file:
+            for key, value in input_file.copy_metadata().items():
+                setattr(output_file, key, value)
+            wav = open_wav_map(input_path)
+            if wav is not None:
+                input_blocks = wav.blocks(block_frames, dtype)
+            else:
+                input_blocks = input_file.blocks(blocksize=block_frames, dtype=dtype, always_2d=True)
+            while True:
+                with time_stage(stats, 'decode'):
+                    block = next(input_blocks, None)
+                if block is None:
+                    break
+                with time_stage(stats, 'encode'):
+                    output_file.write(add_dither(block, subtype, rng) if dither else block)
+        frames, samplerate = input_file.frames, input_file.samplerate
+
+    if stats is not None:
+        stats.sr, stats.frames_in = samplerate, frames
+        stats.add_output(output_path, frames)
+
+# Function to read a whole file for transcoding, in the same sample types as transcode_file
+# Returns what write_transcoded needs: (samples, sampling rate, output sample format, dither or not, text metadata)
+# The samples are always read into memory here, also from memory-mapped WAV files, since this is the reading stage
+def read_for_transcode(input_path, output_format, stats=None, encoding=None):
+    encoding = encoding or DEFAULT_ENCODING
+    with time_stage(stats, 'decode'), sf.SoundFile(input_path) as input_file:
+        subtype, dtype, dither = get_transcode_plan(input_file.subtype, output_format, encoding)
+        wav = open_wav_map(input_path)
+        if wav is not None:
+            data = np.array(wav.read(dtype=dtype))
+        else:
+            data = input_file.read(dtype=dtype, always_2d=True)
+        decoded = data, input_file.samplerate, subtype, dither, input_file.copy_metadata()
+    if stats is not None:
+        stats.sr, stats.frames_in = decoded[1], len(data)
+    return decoded
+
+# Function to write a file read by read_for_transcode in the output format
+def write_transcoded(output_path, output_format, decoded, stats=None, encoding=None):
+    data, samplerate, subtype, dither, metadata = decoded
+    with time_stage(stats, 'encode'), sf.SoundFile(output_path, 'w', samplerate=samplerate, channels=data.shape[1],
+                                                   format=output_format, subtype=subtype,
+                                                   **get_write_options(encoding or DEFAULT_ENCODING, output_format)) as output_file:
+        for key, value in metadata.items():
+            setattr(output_file, key, value)
+        output_file.write(add_dither(data, subtype, get_dither_rng(output_path)) if dither else data)
+    if stats is not None:
+        stats.add_output(output_path, len(data))
+
+# Function to get the output filename of a converted file (extension changed to .flac/.wav)
+def get_transcode_filename(filename, output_format):
+    return os.path.splitext(filename)[0] + "." + output_format.lower()
+
+# Function to convert a file to FLAC or WAV (output_format = 'FLAC' or 'WAV')
+# Returns (filename, signature of the input for the job manifest, report.FileStats of the file)
+def convert_file(filename, input_folder, output_folder, output_format, encoding=None):
+    file_path = os.path.join(input_folder, filename)
+    output_path = os.path.join(output_folder, get_transcode_filename(filename, output_format))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    stats = FileStats(filename, file_path)
+
+    # Write the output file (same samples, bit depth and channels as the original)
+    transcode_file(file_path, output_path, output_format, stats=stats, encoding=encoding)
+
+    return filename, sign_file(file_path, stats), stats
+
+##########################################################################
+#       JOB MANIFEST (SKIP FINISHED FILES AND RESUME INTERRUPTED RUNS)
+##########################################################################
+
+# Name of the manifest kept in each output folder; one JSON record is appended per finished file
+MANIFEST_FILENAME = '.ezaudiomate_manifest.jsonl'
+
+# Name of the manifest of one worker of a distributed job (see workqueue); appending to one shared file from
+# several machines is not safe on network filesystems, so each worker keeps its own
+WORKER_MANIFEST_FILENAME = '.ezaudiomate_manifest.{worker_id}.jsonl'
+
+# Number of bytes read at a time when hashing a file
+HASH_BLOCK_SIZE = 1 << 20
+
+# Function to write a JSON file that other processes and machines never see half written: written under a name of its
+# own (host, process and thread), then renamed, so two writers of the same file never write to the same temporary file
+def write_json_file(path, data, indent=None):
+    temp_path = f"{path}.{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+
+# Function to hash the contents of a file
+def hash_file(path):
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+# Function to get the size, modification time and content hash of an input file
+# Without content_hash the hash is left out (None), so a file modified since its last run is always redone
+def get_file_signature(path, content_hash=True):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': hash_file(path) if content_hash else None}
+
+# Record of the files already written to an output folder, the inputs they came from and the settings used
+# The records of every manifest in the folder (the shared one and those of distributed workers) are read;
+# new records go to the shared manifest, or to the worker's own one when worker_id is given
+class JobManifest:
+    def __init__(self, output_folder, worker_id=None):
+        self.output_folder = output_folder
+        filename = MANIFEST_FILENAME if worker_id is None else WORKER_MANIFEST_FILENAME.format(worker_id=worker_id)
+        self.path = os.path.join(output_folder, filename)
+        self.entries = {}  # output filename -> latest record
+        self.lock = threading.Lock()  # records are added by the job and, when refreshed, by the pipeline's reader threads
+        self.hashes = {}  # (input path, modification time) -> content hash, so an input is hashed once for all its outputs
+        manifest_names = sorted(name for name in os.listdir(output_folder)
+                                if name.startswith('.ezaudiomate_manifest') and name.endswith('.jsonl')) \
+            if os.path.isdir(output_folder) else []
+        for name in manifest_names:
+            with open(os.path.join(output_folder, name), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # the last line can be cut short if a run was killed while writing it
+                    latest = self.entries.get(entry['output'])
+                    if latest is None or entry['completed'] >= latest['completed']:
+                        self.entries[entry['output']] = entry
+
+    # Function to check if an output is up to date with its input file and the current settings
+    def is_done(self, input_path, input_name, output_name, settings):
+        entry = self.entries.get(output_name)
+        if entry is None or entry['input'] != input_name or entry['settings'] != settings:
+            return False
+        if not os.path.exists(os.path.join(self.output_folder, output_name)):
+            return False
+
+        stat = os.stat(input_path)
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+        # Same size but modified since the last run: only the contents can tell if it really changed
+        if entry['hash'] is None:
+            return False
+        key = (input_path, stat.st_mtime_ns)
+        if key not in self.hashes:
+            self.hashes[key] = hash_file(input_path)
+        if self.hashes[key] != entry['hash']:
+            return False
+        # Unchanged contents: the record is refreshed with the new modification time so the next runs don't hash it again
+        self.append({**entry, 'mtime_ns': stat.st_mtime_ns, 'completed': time.strftime('%Y-%m-%d %H:%M:%S')})
+        return True
+
+    # Function to record a finished file (written straight away so a crash loses at most the file in progress)
+    def record(self, input_name, output_name, settings, signature):
+        self.append({'input': input_name, 'output': output_name, 'settings': settings, **signature,
+                     'completed': time.strftime('%Y-%m-%d %H:%M:%S')})
+
+    # Function to add a record to the manifest
+    def append(self, entry):
+        with self.lock:
+            self.entries[entry['output']] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+##########################################################################
+#       BATCH JOBS (ONE FOLDER, OR FOLDER TREE, AT A TIME)
+##########################################################################
+
+# Function to hand out the files found by a scanner that still need processing, with their pending outputs
+# get_pending_outputs(filename) lists the outputs of a file that are not done yet; files with none left are
+# reported through skip_callback instead. Once cancel_event is set no more files are handed out (and the scan stops)
+def get_pending_files(scanner, get_pending_outputs, skip_callback, cancel_event=None):
+    for filename in scanner:
+        if cancel_event is not None and cancel_event.is_set():
+            scanner.close()
+            return
+        pending = get_pending_outputs(filename)
+        if not pending:
+            skip_callback(filename)
+            continue
+        yield filename, pending
+
+# Function to end a batch job: saves the run report and returns the summary of the run
+# Raises NoAudioFilesError (with no_files_message) if the folder had no files for the job and it was not cancelled
+def get_summary(scanner, counts, report, output_folder, save_report, cancel_event, no_files_message):
+    cancelled = cancel_event is not None and cancel_event.is_set()
+    if scanner.found == 0 and not cancelled:
+        raise NoAudioFilesError(no_files_message)
+    return {'total': scanner.found, 'processed': counts['done'] - counts['skipped'], 'skipped': counts['skipped'],
+            'cancelled': cancelled, 'report': report,
+            'report_path': report.save(output_folder) if save_report else None}
+
+# Function to resample every audio file in a folder (and its subfolders if recursive) to one or several rates
+# desired_sr can be a single rate or a list of rates; with several rates each file is decoded once and the
+# rate is always added to the output filenames
+# progress_callback(done, total, filename, report) is called after each file, where total is the number of files
+# found so far (it grows while the folder is still being scanned) and report is the report.RunReport of the run
+# (for the live throughput and ETA); the report is saved in the output folder unless save_report=False
+# encoding (see get_encoding) sets the output sample format, dither and FLAC compression level
+# Setting cancel_event (a threading.Event) stops the job cleanly: no new files are started, the files in progress are
+# finished and recorded, and the summary has cancelled=True
+# Returns a summary of the run (with the report and the path it was saved to)
+# With pipeline=True (whole files in whole-file mode only), the files are decoded, resampled and written by separate
+# threads (readers, num_workers and writers threads) so reading from network storage overlaps the DSP and the writing;
+# read_ahead and write_behind are the numbers of decoded/resampled files waiting between the stages
+# window (see get_time_window) resamples only part of each file and/or splits it into segments, one output file
+# per segment named after the time it starts at (see get_segment_filename)
+# channels (see get_channels) mixes the channels down to mono (the default), or keeps all or some of them
+# files (relative paths) processes those files instead of scanning the input folder; manifest and report are used
+# instead of new ones (the leases of a distributed worker, see workqueue, share them)
+# inventory (see inventory.take_inventory) processes the files of the inventory instead of scanning the input folder,
+# and weights the progress (report.get_progress_fraction and the ETA) by the duration of the files
+# With skip_same_rate a file is not resampled to the rates it already has (files already at every desired rate are
+# skipped); the rates come from the inventory when there is one, otherwise from the file headers
+def resample_folder(input_folder, output_folder, desired_sr, include_sr=False, streaming=False, quality='balanced',
+                    num_workers=1, skip_done=True, recursive=False, progress_callback=None,
+                    pipeline=False, readers=2, writers=2, read_ahead=2, write_behind=2, save_report=True,
+                    cancel_event=None, encoding=None, window=None, channels=DEFAULT_CHANNELS,
+                    files=None, manifest=None, report=None, inventory=None, skip_same_rate=False):
+    target_srs = get_target_rates(desired_sr)
+    include_sr = include_sr or len(target_srs) > 1
+    encoding = encoding or DEFAULT_ENCODING
+    window = window or DEFAULT_WINDOW
+    whole_files = is_whole_file(window)
+    pipeline = pipeline and not streaming and whole_files
+    if files is None and inventory is not None:
+        files = inventory.files
+    if files is None:
+        scanner = FolderScanner(input_folder, RESAMPLE_EXTENSIONS, recursive, exclude=output_folder)
+    else:
+        scanner = FileList(files)
+    manifest = manifest or JobManifest(output_folder)
+    # The encoding is always part of the settings: before it could be chosen, outputs were always written as 16-bit
+    # The window and channels are only recorded when they are not the defaults, so older manifests stay valid
+    settings = {rate: {'job': 'resample', 'desired_sr': rate, 'streaming': streaming, 'quality': quality, **encoding,
+                       **({} if whole_files else {'window': window}),
+                       **({} if channels == DEFAULT_CHANNELS else {'channels': channels})}
+                for rate in target_srs}
+    report = report or RunReport('resample', {'input_folder': input_folder, 'output_folder': output_folder,
+                                              'desired_sr': target_srs, 'include_sr': include_sr, 'streaming': streaming,
+                                              'quality': quality, 'num_workers': num_workers, 'skip_done': skip_done,
+                                              'recursive': recursive, 'pipeline': pipeline, **encoding,
+                                              'window': window, 'channels': channels,
+                                              'skip_same_rate': skip_same_rate})
+    if inventory is not None:
+        report.set_durations(inventory.get_durations(window))
+    counts = {'done': 0, 'skipped': 0}
+    finish_lock = threading.Lock()
+    file_segments = {}  # filename -> (sampling rate, segments), from the header, until the file is finished
+
+    # Function to get the output filenames of a file at a rate (one per segment with a time window)
+    def get_output_names(filename, rate):
+        if whole_files:
+            return [get_output_filename(filename, rate, include_sr)]
+        if filename not in file_segments:
+            info = sf.info(os.path.join(input_folder, filename))
+            file_segments[filename] = info.samplerate, get_segments(info.frames, info.samplerate, window)
+        sr, segments = file_segments[filename]
+        return [get_segment_filename(filename, rate, include_sr, first / sr) for first, _ in segments]
+
+    # Function to get the sampling rate of a file from its header (read once, in the inventory if there is one)
+    def get_file_rate(filename):
+        if inventory is not None and inventory.get_rate(filename) is not None:
+            return inventory.get_rate(filename)
+        return sf.info(os.path.join(input_folder, filename)).samplerate
+
+    # Function to list the rates of a file that were not already resampled with the same settings
+    # (with a time window, a rate is done when all of its segments are; files that end before the window have none)
+    def get_pending_rates(filename):
+        rates = target_srs
+        if skip_same_rate:
+            rates = [rate for rate in rates if rate != get_file_rate(filename)]
+        if not skip_done:
+            return rates
+        file_path = os.path.join(input_folder, filename)
+        return [rate for rate in rates
+                if not all(manifest.is_done(file_path, filename, output_name, settings[rate])
+                           for output_name in get_output_names(filename, rate))]
+
+    # Function to count a finished (or skipped) file and report the progress
+    # (locked, as the pipeline reports skipped files from its reader threads)
+    def finish(filename, rates=(), signature=None, stats=None):
+        with finish_lock:
+            if signature is None:
+                counts['skipped'] += 1
+            for rate in rates:
+                for output_name in get_output_names(filename, rate):
+                    manifest.record(filename, output_name, settings[rate], signature)
+            file_segments.pop(filename, None)
+            report.add(stats, filename)
+            counts['done'] += 1
+            if progress_callback:
+                progress_callback(counts['done'], scanner.found, filename, report)
+
+    files_to_process = get_pending_files(scanner, get_pending_rates, finish, cancel_event)
+
+    if pipeline:
+        # Pipelined path: stage functions get the (filename, rates) entries handed out by get_pending_files
+        def read(entry):
+            file_path = os.path.join(input_folder, entry[0])
+            stats = FileStats(entry[0], file_path)
+            y, sr = load_file(file_path, stats, in_memory=True, channels=channels)
+            # Hashed right after reading, while the file is cached
+            return y, sr, sf.info(file_path), sign_file(file_path, stats), stats
+
+        def resample(entry, decoded):
+            y, sr, info, signature, stats = decoded
+            return resample_to_rates(y, sr, entry[1], quality, stats), info, signature, stats
+
+        def write(entry, result):
+            resampled, info, signature, stats = result
+            save_resampled(resampled, get_output_paths(entry[0], entry[1], output_folder, include_sr), info, encoding, stats)
+            return signature, stats
+
+        run_pipeline(files_to_process, read, resample, write, lambda entry, value: finish(*entry, *value),
+                     readers=readers, processors=num_workers, writers=writers,
+                     read_ahead=read_ahead, write_behind=write_behind)
+    elif num_workers == 1:
+        # Sequential path: resample the files one at a time
+        for filename, rates in files_to_process:
+            _, signature, stats = process_file(filename, rates, input_folder, output_folder, include_sr, streaming, quality,
+                                               encoding, window, channels)
+            finish(filename, rates, signature, stats)
+    else:
+        # Parallel path: send the files to a pool of worker processes as they are found
+        # Results finish out of order, so progress counts completed files rather than list positions
+        # The workers are started with "spawn": forking would copy this process in the middle of its other threads
+        # (the GUI, the folder scanner), which can deadlock the workers
+        with ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {}  # future -> rates being made
+            for filename, rates in files_to_process:
+                future = executor.submit(process_file, filename, rates, input_folder, output_folder, include_sr, streaming,
+                                         quality, encoding, window, channels)
+                futures[future] = rates
+                # Keep only a few files queued per worker so finished files are recorded while the scan goes on
+                if len(futures) >= 2 * num_workers:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        filename, signature, stats = future.result()
+                        finish(filename, futures.pop(future), signature, stats)
+            if cancel_event is not None and cancel_event.is_set():
+                for future in futures:
+                    future.cancel()  # only succeeds for files not started yet
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                filename, signature, stats = future.result()
+                finish(filename, futures[future], signature, stats)
+
+    return get_summary(scanner, counts, report, output_folder, save_report, cancel_event,
+                       f"No valid audio files found in {input_folder}")
+
+# Function to convert every audio file in a folder (and its subfolders if recursive) to FLAC or WAV
+# (output_format = 'FLAC' or 'WAV'); progress, cancelling, the pipeline settings and files/manifest/report/inventory
+# work like in resample_folder (with pipeline=True, the writer threads do the encoding)
+def transcode_folder(input_folder, output_folder, output_format, skip_done=True, recursive=False, progress_callback=None,
+                     pipeline=False, readers=2, writers=2, read_ahead=2, write_behind=2, save_report=True,
+                     cancel_event=None, encoding=None, files=None, manifest=None, report=None, inventory=None):
+    extensions = TRANSCODE_EXTENSIONS[output_format]
+    encoding = encoding or DEFAULT_ENCODING
+    if files is None and inventory is not None:
+        files = inventory.files
+    if files is None:
+        scanner = FolderScanner(input_folder, extensions, recursive, exclude=output_folder)
+    else:
+        scanner = FileList(files)
+    manifest = manifest or JobManifest(output_folder)
+    # Only encoding settings that differ from the defaults are recorded: the defaults write the same files as before
+    # they could be chosen, so older manifests stay valid
+    settings = {'job': output_format.lower(),
+                **{key: value for key, value in encoding.items() if value != DEFAULT_ENCODING[key]}}
+    report = report or RunReport(output_format.lower(), {'input_folder': input_folder, 'output_folder': output_folder,
+                                                         'skip_done': skip_done, 'recursive': recursive,
+                                                         'pipeline': pipeline, **encoding})
+    if inventory is not None:
+        report.set_durations(inventory.get_durations())
+    counts = {'done': 0, 'skipped': 0}
+    finish_lock = threading.Lock()
+
+    # Function to check if a file still has to be converted (same pending-outputs form as resample_folder)
+    def get_pending_formats(filename):
+        if skip_done and manifest.is_done(os.path.join(input_folder, filename), filename,
+                                          get_transcode_filename(filename, output_format), settings):
+            return []
+        return [output_format]
+
+    # Function to count a finished (or skipped) file and report the progress (locked like in resample_folder)
+    def finish(filename, formats=(), signature=None, stats=None):
+        with finish_lock:
+            if signature is None:
+                counts['skipped'] += 1
+            else:
+                manifest.record(filename, get_transcode_filename(filename, output_format), settings, signature)
+            report.add(stats, filename)
+            counts['done'] += 1
+            if progress_callback:
+                progress_callback(counts['done'], scanner.found, filename, report)
+
+    files_to_convert = get_pending_files(scanner, get_pending_formats, finish, cancel_event)
+
+    if pipeline:
+        # Pipelined path: nothing to do between reading and writing, so the middle stage only passes the data on
+        def read(entry):
+            file_path = os.path.join(input_folder, entry[0])
+            stats = FileStats(entry[0], file_path)
+            return read_for_transcode(file_path, output_format, stats, encoding), sign_file(file_path, stats), stats
+
+        def write(entry, result):
+            decoded, signature, stats = result
+            output_path = os.path.join(output_folder, get_transcode_filename(entry[0], output_format))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            write_transcoded(output_path, output_format, decoded, stats, encoding)
+            return signature, stats
+
+        run_pipeline(files_to_convert, read, lambda entry, result: result, write,
+                     lambda entry, value: finish(*entry, *value),
+                     readers=readers, writers=writers, read_ahead=read_ahead, write_behind=write_behind)
+    else:
+        for filename, formats in files_to_convert:
+            _, signature, stats = convert_file(filename, input_folder, output_folder, output_format, encoding)
+            finish(filename, formats, signature, stats)
+
+    return get_summary(scanner, counts, report, output_folder, save_report, cancel_event,
+                       f"No {' or '.join(extensions)} files found in {input_folder}")
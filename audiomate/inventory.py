@@ -0,0 +1,191 @@
+# Inventory of the input folder of a job: the length, sampling rate, channels and sample format of every audio file,
+# read from the file headers only (soundfile.info), so a folder can be sized up before a run without decoding anything
+# The headers are read by several threads (on network storage most of the time is spent waiting for the server) and
+# cached in the output folder by path, size and modification time, so the next inventory only reads new or changed
+# files. A job given an inventory (see resample_folder) weights its progress by audio duration instead of file count
+
+import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import soundfile as sf
+from . import core
+from .report import format_duration
+from .scanner import scan_audio_files
+
+# Name of the header cache kept in the output folder ({absolute path of the input: record})
+INVENTORY_FILENAME = '.ezaudiomate_inventory.json'
+
+# Threads reading headers at the same time
+INVENTORY_THREADS = 8
+
+# Bits per sample of the float sample formats (the integer ones are in core.SUBTYPE_BITS)
+FLOAT_BITS = {'FLOAT': 32, 'DOUBLE': 64}
+
+# Function to read the header of an audio file: its sampling rate, length in frames, channels and sample format
+def read_header(path):
+    info = sf.info(path)
+    return {'sr': info.samplerate, 'frames': info.frames, 'channels': info.channels, 'format': info.format,
+            'subtype': info.subtype}
+
+# Function to read the header cache of an output folder; a missing or damaged cache is an empty one
+def load_inventory_cache(output_folder):
+    try:
+        with open(os.path.join(output_folder, INVENTORY_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# Function to save the header cache of an output folder (see core.write_json_file: a run killed while saving it leaves
+# the old cache, and inventories of the same folder running at once do not mix their writes; the last one saved wins)
+def save_inventory_cache(output_folder, cache):
+    os.makedirs(output_folder, exist_ok=True)
+    core.write_json_file(os.path.join(output_folder, INVENTORY_FILENAME), cache)
+
+# Function to take the inventory of the audio files of a job in a folder (and its subfolders if recursive)
+# With an output folder the headers are cached there (and the output folder is not scanned if it is inside the input)
+# progress_callback(done, total, filename) is called after each header; setting cancel_event stops reading headers
+# (the files not read yet are left out of the inventory)
+# Files whose header cannot be read are kept, with the error, so the job reports them like it would without an inventory
+def take_inventory(input_folder, extensions, recursive=False, output_folder=None, num_threads=INVENTORY_THREADS,
+                   progress_callback=None, cancel_event=None):
+    files = list(scan_audio_files(input_folder, extensions, recursive, exclude=output_folder))
+    cache = load_inventory_cache(output_folder) if output_folder else {}
+
+    # Function to get the record of a file: from the cache if the file did not change since, otherwise from its header
+    def probe(filename):
+        path = os.path.abspath(os.path.join(input_folder, filename))
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            return path, {'size': 0, 'mtime_ns': 0, 'error': str(e)}, False
+        cached = cache.get(path)
+        if cached is not None and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return path, cached, True
+        record = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        try:
+            record.update(read_header(path))
+        except (RuntimeError, OSError) as e:
+            record['error'] = str(e)
+        return path, record, False
+
+    records = {}
+    cached = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, num_threads))
+    try:
+        for filename, (path, record, from_cache) in zip(files, executor.map(probe, files)):
+            records[filename] = record
+            cached += from_cache
+            if not from_cache and 'error' not in record:
+                cache[path] = record
+            if progress_callback:
+                progress_callback(len(records), len(files), filename)
+            if cancel_event is not None and cancel_event.is_set():
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if output_folder and cached < len(records):
+        save_inventory_cache(output_folder, cache)
+    return Inventory(input_folder, records, cached)
+
+# Headers of the audio files of a job (see take_inventory), in scan order, and the totals of the job they make
+class Inventory:
+    def __init__(self, input_folder, records, cached=0):
+        self.input_folder = input_folder
+        self.records = records  # relative path -> header record (or the error that kept it from being read)
+        self.files = list(records)
+        self.cached = cached    # number of records that came from the cache
+
+    # Function to get the sampling rate of a file, or None if its header could not be read
+    def get_rate(self, filename):
+        return self.records.get(filename, {}).get('sr')
+
+    # Function to get the frames of a file that a job resamples: all of them, or those in a time window
+    def get_job_frames(self, filename, window=None):
+        record = self.records[filename]
+        if 'error' in record:
+            return 0
+        return sum(end - first for first, end in core.get_segments(record['frames'], record['sr'],
+                                                                    window or core.DEFAULT_WINDOW))
+
+    # Function to get the seconds of audio of each file that a job processes ({filename: seconds}), to weight
+    # the progress of the job by duration
+    def get_durations(self, window=None):
+        return {filename: self.get_job_frames(filename, window) / record['sr'] if 'error' not in record else 0.0
+                for filename, record in self.records.items()}
+
+    # Function to sum up the inventory: files, sizes, duration, sampling rates, channel counts and sample formats
+    # With desired_sr (one or several rates, see core.get_target_rates) it also counts the files already at a desired
+    # rate and estimates the size of the outputs of a resampling job with these settings (FLAC outputs are estimated
+    # with the compression ratio of their input); with skip_same_rate the files already at a rate make no output at it
+    def get_summary(self, desired_sr=None, window=None, channels=core.DEFAULT_CHANNELS, encoding=None,
+                    skip_same_rate=False):
+        encoding = encoding or core.DEFAULT_ENCODING
+        target_srs = core.get_target_rates(desired_sr) if desired_sr is not None else []
+        summary = {'files': len(self.records), 'cached': self.cached, 'input_bytes': 0, 'seconds': 0.0,
+                   'job_seconds': 0.0, 'rates': Counter(), 'channels': Counter(), 'formats': Counter(),
+                   'unreadable': {}, 'same_rate': 0, 'output_bytes': 0 if target_srs else None}
+
+        for filename, record in self.records.items():
+            summary['input_bytes'] += record['size']
+            if 'error' in record:
+                summary['unreadable'][filename] = record['error']
+                continue
+            sr = record['sr']
+            job_frames = self.get_job_frames(filename, window)
+            summary['seconds'] += record['frames'] / sr
+            summary['rates'][sr] += 1
+            summary['channels'][record['channels']] += 1
+            summary['formats'][f"{record['format']} {record['subtype']}"] += 1
+            if sr in target_srs:
+                summary['same_rate'] += 1
+            rates = [rate for rate in target_srs if not (skip_same_rate and rate == sr)]
+            if target_srs and not rates:
+                continue  # skipped by the job
+            summary['job_seconds'] += job_frames / sr
+            if not target_srs:
+                continue
+
+            # Size of the samples of each output (the outputs keep the format of their input)
+            subtype = core.get_output_subtype(encoding, record['subtype'], record['format'])
+            bits = core.SUBTYPE_BITS.get(subtype) or FLOAT_BITS.get(subtype, 16)
+            if channels == 'mono':
+                output_channels = 1
+            elif channels == 'all':
+                output_channels = record['channels']
+            else:
+                output_channels = len(channels)
+            ratio = 1.0
+            if record['format'] == 'FLAC' and record['frames']:
+                source_bits = core.SUBTYPE_BITS.get(record['subtype'], 16)
+                ratio = min(1.0, record['size'] / (record['frames'] * record['channels'] * source_bits / 8))
+            for rate in rates:
+                summary['output_bytes'] += job_frames * rate / sr * output_channels * bits / 8 * ratio
+        return summary
+
+    # Function to describe the inventory in a few lines (see get_summary for the arguments)
+    def get_summary_text(self, desired_sr=None, window=None, channels=core.DEFAULT_CHANNELS, encoding=None,
+                         skip_same_rate=False):
+        summary = self.get_summary(desired_sr, window, channels, encoding, skip_same_rate)
+
+        # Function to list the values of a counter, most common first
+        def count_text(counter, unit=''):
+            return ', '.join(f"{value}{unit} ({count} file(s))" for value, count in counter.most_common())
+
+        lines = [f"Inventory: {summary['files']} file(s), {summary['input_bytes'] / 1e6:.1f} MB, "
+                 f"{format_duration(summary['seconds'])} of audio ({summary['cached']} header(s) from the cache)."]
+        if summary['rates']:
+            lines.append(f"Sampling rates: {count_text(summary['rates'], ' Hz')}.")
+            lines.append(f"Channels: {count_text(summary['channels'])}.")
+            lines.append(f"Formats: {count_text(summary['formats'])}.")
+        if summary['same_rate']:
+            lines.append(f"Already at a desired rate: {summary['same_rate']} file(s)"
+                         f"{' (not resampled to it)' if skip_same_rate else ''}.")
+        if summary['output_bytes'] is not None:
+            lines.append(f"To resample: {format_duration(summary['job_seconds'])} of audio, "
+                         f"about {summary['output_bytes'] / 1e6:.1f} MB of output.")
+        if summary['unreadable']:
+            filename, error = next(iter(summary['unreadable'].items()))
+            lines.append(f"Unreadable: {len(summary['unreadable'])} file(s), e.g. {filename}: {error}")
+        return '\n'.join(lines)
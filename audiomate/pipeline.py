@@ -0,0 +1,135 @@
+# Three-stage file pipeline: reader threads prefetch (decode) the next files, processing threads work on them and
+# writer threads encode and save the results, so reading from slow/network storage, the DSP and the writing overlap
+#
+# The stages are joined by bounded queues, so at most
+#   readers + read_ahead + processors + write_behind + writers
+# files are held in memory at any time.
+
+import queue
+import threading
+
+# Marks the end of the items in the queues between the stages
+_END = object()
+
+# How often (in seconds) a blocked stage checks if the pipeline was stopped because of an error
+_POLL_INTERVAL = 0.2
+
+# Function to run items through read -> process -> write, with several threads per stage
+#   read(item) -> data            (reader threads)
+#   process(item, data) -> result (processing threads)
+#   write(item, result) -> value  (writer threads)
+#   on_done(item, value)          (called in the calling thread as each item finishes, in completion order)
+# The first error raised by a stage stops the pipeline and is raised again here
+def run_pipeline(items, read, process, write, on_done, readers=2, processors=1, writers=2, read_ahead=2, write_behind=2):
+    items = iter(items)
+    items_lock = threading.Lock()
+    read_queue = queue.Queue(maxsize=max(1, read_ahead))
+    write_queue = queue.Queue(maxsize=max(1, write_behind))
+    done_queue = queue.Queue()
+    stop = threading.Event()
+    errors = []
+
+    # Function to put an item on a queue, giving up if the pipeline was stopped while waiting for space
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # Function to get an item from a queue (_END once the pipeline was stopped)
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _END
+
+    # Function to record the first error and stop all the stages
+    def fail(error):
+        errors.append(error)
+        stop.set()
+
+    def reader():
+        while not stop.is_set():
+            with items_lock:
+                item = next(items, _END)
+            if item is _END:
+                return
+            try:
+                data = read(item)
+            except BaseException as e:
+                fail(e)
+                return
+            if not put(read_queue, (item, data)):
+                return
+
+    def processor():
+        while True:
+            entry = get(read_queue)
+            if entry is _END:
+                return
+            item, data = entry
+            try:
+                result = process(item, data)
+            except BaseException as e:
+                fail(e)
+                return
+            del data  # free the decoded input before waiting for space in the write queue
+            if not put(write_queue, (item, result)):
+                return
+
+    def writer():
+        while True:
+            entry = get(write_queue)
+            if entry is _END:
+                return
+            item, result = entry
+            try:
+                value = write(item, result)
+            except BaseException as e:
+                fail(e)
+                return
+            done_queue.put((item, value))
+
+    # Function to run a stage on several threads, then pass one end marker per thread of the next stage
+    def start_stage(target, count, next_queue, next_count):
+        threads = [threading.Thread(target=target, daemon=True) for _ in range(max(1, count))]
+        for thread in threads:
+            thread.start()
+
+        def close():
+            for thread in threads:
+                thread.join()
+            for _ in range(next_count):
+                if next_queue is done_queue:
+                    done_queue.put(_END)  # always delivered, the calling thread waits for it even after an error
+                else:
+                    put(next_queue, _END)
+        closer = threading.Thread(target=close, daemon=True)
+        closer.start()
+        return closer
+
+    processors, writers = max(1, processors), max(1, writers)
+    stages = [
+        start_stage(reader, readers, read_queue, processors),
+        start_stage(processor, processors, write_queue, writers),
+        start_stage(writer, writers, done_queue, 1),
+    ]
+
+    try:
+        while True:
+            entry = done_queue.get()
+            if entry is _END:
+                break
+            on_done(*entry)
+    finally:
+        stop.set()  # only still running if on_done raised; makes every stage give up
+        for stage in stages:
+            stage.join()
+
+    if errors:
+        raise errors[0]
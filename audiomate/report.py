@@ -0,0 +1,177 @@
+# Run reports: the time each file took in each stage (decode, resample, encode, hash), the bytes read and written
+# and the frames processed, with the throughput of the whole run
+# A report is saved per run in <output folder>/ezaudiomate_reports as JSON (totals + files) and CSV (one row per file)
+#
+# Stages:
+#   decode   = reading and decoding the input
+#   resample = resampling (not used when converting)
+#   encode   = encoding and writing the outputs
+#   hash     = hashing the input for the job manifest
+
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# Folder (inside the output folder) where the run reports are saved
+REPORT_FOLDER = 'ezaudiomate_reports'
+
+# Order of the stage columns in the CSV report
+STAGES = ('decode', 'resample', 'encode', 'hash')
+
+# Columns of the CSV report (the keys of FileStats.to_dict)
+CSV_FIELDS = ['file', 'seconds', 'audio_seconds', 'sr', 'frames_in', 'frames_out', 'input_bytes', 'output_bytes'] + \
+             [f'{stage}_s' for stage in STAGES]
+
+# Measurements of one processed file
+# NOTE: these are made where the file is processed (possibly a worker process), so they must stay picklable
+class FileStats:
+    def __init__(self, filename, input_path):
+        self.filename = filename
+        self.input_bytes = os.path.getsize(input_path)
+        self.output_bytes = 0
+        self.sr = 0
+        self.frames_in = 0   # frames decoded from the input
+        self.frames_out = 0  # frames written to all the outputs
+        self.stages = {}     # stage -> seconds
+
+    # Function to time a stage (times of the same stage add up, e.g. when a file is processed block by block)
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    # Function to count a finished output file
+    def add_output(self, path, frames):
+        self.output_bytes += os.path.getsize(path)
+        self.frames_out += frames
+
+    # Function to get the measurements as one flat record (one CSV row)
+    def to_dict(self):
+        record = {
+            'file': self.filename,
+            'seconds': sum(self.stages.values()),
+            'audio_seconds': self.frames_in / self.sr if self.sr else 0.0,
+            'sr': self.sr,
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'input_bytes': self.input_bytes,
+            'output_bytes': self.output_bytes,
+        }
+        for stage in STAGES:
+            record[f'{stage}_s'] = self.stages.get(stage, 0.0)
+        return record
+
+# Function to time a stage of a file when measurements are being made (stats can be None)
+def time_stage(stats, name):
+    return stats.stage(name) if stats is not None else nullcontext()
+
+# Function to format seconds as h:mm:ss
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    return f'{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}'
+
+# Measurements of a whole run: one record per processed file plus the number of skipped files
+class RunReport:
+    def __init__(self, job, settings):
+        self.job = job
+        self.settings = settings
+        self.started = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.start_time = time.perf_counter()
+        self.files = []  # FileStats.to_dict() records, in completion order
+        self.skipped = 0
+        # Running sums of the records, so the live progress does not go through every file again
+        self.sums = dict.fromkeys(['input_bytes', 'output_bytes', 'audio_seconds'] + [f'{stage}_s' for stage in STAGES], 0)
+        # Seconds of audio of each file of the job, when known (see set_durations), and of the files done so far
+        self.durations = {}
+        self.total_seconds = 0.0
+        self.done_seconds = 0.0
+
+    # Function to weight the progress by audio duration instead of file count ({filename: seconds}, from an inventory)
+    def set_durations(self, durations):
+        self.durations = durations
+        self.total_seconds = sum(durations.values())
+
+    # Function to add a processed file (stats) or a skipped file (None, with its filename to weight the progress)
+    def add(self, stats, filename=None):
+        self.done_seconds += self.durations.get(filename if stats is None else stats.filename, 0.0)
+        if stats is None:
+            self.skipped += 1
+            return
+        record = stats.to_dict()
+        self.files.append(record)
+        for key in self.sums:
+            self.sums[key] += record[key]
+
+    # Function to get the totals of the run, its throughput and the time spent in each stage
+    def get_totals(self):
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            'processed': len(self.files),
+            'skipped': self.skipped,
+            'elapsed_s': elapsed,
+            'input_bytes': self.sums['input_bytes'],
+            'output_bytes': self.sums['output_bytes'],
+            'audio_seconds': self.sums['audio_seconds'],
+            'mb_per_s': self.sums['input_bytes'] / 1e6 / elapsed if elapsed else 0.0,
+            'realtime': self.sums['audio_seconds'] / elapsed if elapsed else 0.0,
+            # Summed over all files, so with several workers these add up to more than the elapsed time
+            'stages_s': {stage: self.sums[f'{stage}_s'] for stage in STAGES},
+        }
+
+    # Function to get the part of the job done (0 to 1): by audio duration when the durations of the files are known,
+    # otherwise by file count
+    def get_progress_fraction(self, done, total):
+        if self.total_seconds:
+            return min(1.0, self.done_seconds / self.total_seconds)
+        return done / total if total else 0.0
+
+    # Function to describe the progress so far: throughput and estimated time left
+    # When the durations of the files are known, the estimate is the audio left at the real-time factor so far;
+    # otherwise it assumes the remaining files take as long as the ones done so far (total grows while
+    # the folder is still being scanned)
+    def get_progress_text(self, done, total):
+        totals = self.get_totals()
+        text = f"{totals['mb_per_s']:.1f} MB/s"
+        if totals['audio_seconds']:
+            text += f", {totals['realtime']:.1f}x real time"
+        if self.total_seconds:
+            text += f", {self.get_progress_fraction(done, total):.0%} of the audio"
+            if totals['realtime']:
+                text += f", ETA {format_duration((self.total_seconds - self.done_seconds) / totals['realtime'])}"
+        elif done:
+            text += f", ETA {format_duration(totals['elapsed_s'] / done * (total - done))}"
+        return text
+
+    # Function to describe the finished run in a few lines: throughput, slowest stage and slowest file
+    def get_summary_text(self):
+        totals = self.get_totals()
+        lines = [f"{totals['processed']} file(s) processed in {format_duration(totals['elapsed_s'])} "
+                 f"({totals['input_bytes'] / 1e6:.1f} MB, {totals['mb_per_s']:.1f} MB/s, "
+                 f"{totals['realtime']:.1f}x real time)."]
+        stage_total = sum(totals['stages_s'].values())
+        if stage_total:
+            shares = ', '.join(f'{stage} {seconds / stage_total:.0%}' for stage, seconds in totals['stages_s'].items() if seconds)
+            lines.append(f'Time per stage: {shares}.')
+            slowest = max(self.files, key=lambda record: record['seconds'])
+            lines.append(f"Slowest file: {slowest['file']} ({slowest['seconds']:.1f} s).")
+        return '\n'.join(lines)
+
+    # Function to save the report as JSON and CSV; returns the path of the JSON file
+    def save(self, output_folder):
+        report_folder = os.path.join(output_folder, REPORT_FOLDER)
+        os.makedirs(report_folder, exist_ok=True)
+        base = os.path.join(report_folder, f"{self.job}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'job': self.job, 'started': self.started, 'settings': self.settings,
+                       'totals': self.get_totals(), 'files': self.files}, f, indent=2)
+        with open(base + '.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.files)
+        return base + '.json'
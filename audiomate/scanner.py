@@ -0,0 +1,88 @@
+# Streaming folder scanner: finds the audio files of a job (optionally in all subfolders) while they are being processed
+# Deployments are stored as site/deployment/day/*.wav trees with hundreds of thousands of files, so the files are
+# handed out as soon as they are found instead of after a full listing
+
+import os
+import queue
+import threading
+
+# Marks the end of the scan in the scanner queue
+_SCAN_FINISHED = object()
+
+# Function to walk a folder with os.scandir and yield the matching files as paths relative to the folder
+# Files and subfolders are visited in name order; like os.walk, folders that cannot be read are skipped
+# and symbolic links to folders are not followed; the exclude folder (e.g. an output folder inside the input folder) is skipped
+def scan_audio_files(folder, extensions, recursive=False, exclude=None, _relative_folder=''):
+    try:
+        with os.scandir(folder) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    subfolders = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if exclude is None or os.path.abspath(entry.path) != os.path.abspath(exclude):
+                    subfolders.append(entry)
+            elif entry.name.lower().endswith(extensions):
+                yield os.path.join(_relative_folder, entry.name)
+        except OSError:
+            continue
+
+    if recursive:
+        for entry in subfolders:
+            yield from scan_audio_files(entry.path, extensions, recursive, exclude, os.path.join(_relative_folder, entry.name))
+
+# Runs scan_audio_files in a background thread so the first files can be processed while the scan continues
+# Iterating over the scanner yields the relative paths in scan order; "found" is the number of files found so far
+class FolderScanner:
+    def __init__(self, folder, extensions, recursive=False, exclude=None):
+        self.found = 0
+        self.finished = False
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._scan, args=(folder, extensions, recursive, exclude), daemon=True)
+        self._thread.start()
+
+    # Function run by the scanning thread
+    def _scan(self, folder, extensions, recursive, exclude):
+        try:
+            for relative_path in scan_audio_files(folder, extensions, recursive, exclude):
+                if self._closed:
+                    return
+                self.found += 1
+                self._queue.put(relative_path)
+        finally:
+            self.finished = True
+            self._queue.put(_SCAN_FINISHED)
+
+    def __iter__(self):
+        while True:
+            relative_path = self._queue.get()
+            if relative_path is _SCAN_FINISHED:
+                return
+            yield relative_path
+
+    # Function to stop the scan early (e.g. when a job is cancelled); the files already found can still be read
+    def close(self):
+        self._closed = True
+
+# Fixed list of files (relative paths) with the same interface as FolderScanner, for jobs that are given their files
+# (e.g. the leases of a distributed job) instead of scanning a folder
+class FileList:
+    def __init__(self, files):
+        self.files = list(files)
+        self.found = len(self.files)
+        self.finished = True
+        self._closed = False
+
+    def __iter__(self):
+        for relative_path in self.files:
+            if self._closed:
+                return
+            yield relative_path
+
+    # Function to stop handing out files (e.g. when a job is cancelled)
+    def close(self):
+        self._closed = True
@@ -0,0 +1,141 @@
+# Memory-mapped reader for uncompressed WAV files (RIFF, RF64/BW64, WAVE_FORMAT_EXTENSIBLE)
+# The data chunk is mapped with numpy.memmap, so frames are read straight from the file (or the OS cache) without
+# going through libsndfile, any range of frames can be read without reading what comes before it, and reads in
+# the file's own sample type are views of the file instead of copies
+#
+# Reads follow the same conventions as soundfile, so either reader can be used for the same file:
+#   int16 / int32     = samples left-justified in 16 / 32 bits (e.g. 24-bit samples are shifted up by 8 bits)
+#   float32 / float64 = samples scaled to -1.0 ... 1.0 (divided by 2 ** (bits - 1))
+# Anything else (compressed WAV, big-endian RIFX, broken headers) is left to soundfile: open_wav_map returns None
+
+import os
+import struct
+import numpy as np
+
+# WAVE format codes of the sample types that can be mapped
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Data chunk size used by RF64/BW64 files (and by some recorders that never fill it in): the real size is elsewhere
+UNKNOWN_SIZE = 0xFFFFFFFF
+
+# Sample format (soundfile subtype names) of each (format code, bits per sample)
+SUBTYPES = {
+    (WAVE_FORMAT_PCM, 8): 'PCM_U8',
+    (WAVE_FORMAT_PCM, 16): 'PCM_16',
+    (WAVE_FORMAT_PCM, 24): 'PCM_24',
+    (WAVE_FORMAT_PCM, 32): 'PCM_32',
+    (WAVE_FORMAT_IEEE_FLOAT, 32): 'FLOAT',
+    (WAVE_FORMAT_IEEE_FLOAT, 64): 'DOUBLE',
+}
+
+# numpy type each sample format is stored as in the file (24-bit samples are mapped as 3 bytes and assembled on read)
+STORAGE_DTYPES = {'PCM_U8': '<u1', 'PCM_16': '<i2', 'PCM_24': '<u1', 'PCM_32': '<i4', 'FLOAT': '<f4', 'DOUBLE': '<f8'}
+
+# Function to read the header of a WAV file; returns (format code, channels, sample rate, bits per sample,
+# offset of the data, size of the data in bytes), or None if it is not a WAV file that can be mapped
+def read_wav_header(path):
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] not in (b'RIFF', b'RF64', b'BW64') or riff[8:12] != b'WAVE':
+            return None
+
+        fmt, data_offset, data_size, ds64_data_size = None, None, None, None
+        while data_offset is None:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, chunk_size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'ds64':
+                # RF64: 64-bit sizes of the RIFF chunk, the data chunk and the sample count
+                ds64 = f.read(chunk_size)
+                ds64_data_size = struct.unpack('<Q', ds64[8:16])[0]
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                f.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                data_size = ds64_data_size if chunk_size == UNKNOWN_SIZE and ds64_data_size is not None else chunk_size
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)  # chunks are padded to an even size
+
+    if fmt is None or len(fmt) < 16:
+        return None
+    format_code, channels, samplerate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if format_code == WAVE_FORMAT_EXTENSIBLE:
+        if len(fmt) < 40:
+            return None
+        format_code = struct.unpack('<H', fmt[24:26])[0]  # first 2 bytes of the SubFormat GUID
+    if (format_code, bits) not in SUBTYPES or channels == 0 or block_align != channels * bits // 8:
+        return None
+
+    # Recordings cut short (or written by recorders that never update the header) have less data than the header says
+    data_size = min(data_size, file_size - data_offset)
+    return format_code, channels, samplerate, bits, data_offset, data_size
+
+# Memory-mapped WAV file; frames are read with read() or blocks(), in the sample types soundfile uses
+class WavMap:
+    def __init__(self, path, header):
+        format_code, self.channels, self.samplerate, self.bits, data_offset, data_size = header
+        self.subtype = SUBTYPES[(format_code, self.bits)]
+        self.frames = data_size // (self.channels * self.bits // 8)
+        if self.frames == 0:
+            self._data = np.zeros((0, self.channels), dtype=STORAGE_DTYPES[self.subtype])
+            return
+        if self.subtype == 'PCM_24':
+            shape = (self.frames, self.channels, 3)
+        else:
+            shape = (self.frames, self.channels)
+        self._data = np.memmap(path, dtype=STORAGE_DTYPES[self.subtype], mode='r', offset=data_offset, shape=shape)
+
+    # Function to read frames start to stop (frames x channels) as dtype ('int16', 'int32', 'float32' or 'float64')
+    # Reads in the file's own sample type (int16 from 16-bit files, int32 from 32-bit files, float32 from float files,
+    # float64 from double files) return read-only views of the file
+    # channels (a list of channel indices) picks some of the channels: the others are never converted
+    def read(self, start=0, stop=None, dtype='float32', channels=None):
+        data = self._data[start:stop]
+        if channels is not None:
+            data = data[:, channels]
+        dtype = np.dtype(dtype)
+
+        if self.subtype in ('FLOAT', 'DOUBLE'):
+            if dtype.kind != 'f':
+                raise ValueError(f"Reading {self.subtype} samples as {dtype} is not supported")
+            return data if data.dtype == dtype else data.astype(dtype)
+
+        # Integer samples, as int32 holding the value of each sample
+        if self.subtype == 'PCM_24':
+            samples = (data[..., 0].astype(np.int32) | (data[..., 1].astype(np.int32) << 8)
+                       | (data[..., 2].astype(np.int8).astype(np.int32) << 16))  # the top byte carries the sign
+        elif self.subtype == 'PCM_U8':
+            samples = data.astype(np.int32) - 128
+        elif (dtype == np.int16 and self.subtype == 'PCM_16') or (dtype == np.int32 and self.subtype == 'PCM_32'):
+            return data
+        else:
+            samples = data
+
+        if dtype.kind == 'f':
+            return (samples / dtype.type(2 ** (self.bits - 1))).astype(dtype, copy=False)
+        target_bits = dtype.itemsize * 8
+        if self.bits > target_bits:
+            return (samples >> (self.bits - target_bits)).astype(dtype)
+        return samples.astype(dtype) << (target_bits - self.bits)
+
+    # Function to read frames start to stop (stop=None = the end of the file) in blocks of frames, like soundfile.blocks
+    def blocks(self, block_frames, dtype='float32', start=0, stop=None, channels=None):
+        stop = self.frames if stop is None else min(stop, self.frames)
+        for block_start in range(start, stop, block_frames):
+            yield self.read(block_start, min(block_start + block_frames, stop), dtype, channels)
+
+# Function to map a WAV file; returns None if the file cannot be mapped (then it should be read with soundfile)
+def open_wav_map(path):
+    if not path.lower().endswith('.wav'):
+        return None
+    try:
+        header = read_wav_header(path)
+    except (OSError, struct.error):
+        return None
+    return WavMap(path, header) if header else None
@@ -0,0 +1,308 @@
+# Distributed batch mode: a work queue in the shared output folder, so several machines (or several worker processes
+# on one machine) can run the same job on a deployment without doing any file twice
+#
+# The coordinator (create_work_queue) lists the input files and splits them into leases of a few files each; workers
+# (run_worker) claim a lease, process its files with resample_folder/transcode_folder and mark it done.
+# The queue is plain files in <output folder>/.ezaudiomate_queue, since SQLite's file locking cannot be trusted on the
+# network filesystems (NFS, SMB) the deployments are stored on:
+#   job.json = the job and its settings (written last, so workers never start on a half-written queue)
+#   pending  = leases waiting for a worker (lease_00042.json = the files of the lease, attempts and errors)
+#   leases   = leases being processed (lease_00042@<worker>.json); the worker touches its lease while it works on it
+#   done     = finished leases
+#   failed   = leases that failed MAX_ATTEMPTS times, with their errors
+# Claims, completions and requeues are renames, which are atomic within one filesystem: when two workers try to claim
+# the same lease only one of the renames succeeds. A lease that was not touched for lease_timeout seconds (its worker
+# died or lost the network) is put back in pending by the next worker that runs out of leases.
+
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from . import core
+from .report import RunReport
+from .scanner import scan_audio_files
+
+# Folder of the queue, inside the output folder
+QUEUE_FOLDER = '.ezaudiomate_queue'
+
+# Subfolders of the queue, one per lease state
+LEASE_STATES = ('pending', 'leases', 'done', 'failed')
+
+# Files per lease
+LEASE_SIZE = 16
+
+# Seconds after which a lease that its worker stopped touching goes back to the queue
+LEASE_TIMEOUT = 600
+
+# Times a lease is tried (by any worker) before it is moved to failed
+MAX_ATTEMPTS = 3
+
+# Seconds a worker waits before looking again when all the remaining leases are held by other workers
+POLL_INTERVAL = 10.0
+
+# Raised when an output folder has no work queue, or already has one
+class WorkQueueError(Exception):
+    pass
+
+# Function to get the folder of the work queue of an output folder
+def get_queue_folder(output_folder):
+    return os.path.join(output_folder, QUEUE_FOLDER)
+
+# Function to get the name of this worker in the lease files: host name and process id
+def get_default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}".replace('@', '-').replace(os.sep, '-')
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Function to create the work queue of a job (coordinator): lists the input files and writes them as leases
+# job = 'resample', 'flac' or 'wav'; settings are the keyword arguments of resample_folder (with desired_sr) or
+# transcode_folder that every worker uses (they must be JSON values); the settings each machine may choose for itself
+# (num_workers, pipeline, ...) are given to run_worker instead
+# The folders are stored as absolute paths, as the workers may be started from any folder
+# Raises WorkQueueError if the output folder already has a queue (unless replace=True) and NoAudioFilesError if
+# there are no files for the job; returns the number of files and leases
+def create_work_queue(input_folder, output_folder, job, settings, recursive=False, lease_size=LEASE_SIZE,
+                      lease_timeout=LEASE_TIMEOUT, replace=False):
+    input_folder, output_folder = os.path.abspath(input_folder), os.path.abspath(output_folder)
+    queue_folder = get_queue_folder(output_folder)
+    if os.path.exists(os.path.join(queue_folder, 'job.json')) and not replace:
+        raise WorkQueueError(f"{output_folder} already has a work queue (replace it to start over)")
+    if os.path.exists(queue_folder):
+        shutil.rmtree(queue_folder)
+    for state in LEASE_STATES:
+        os.makedirs(os.path.join(queue_folder, state))
+
+    extensions = core.RESAMPLE_EXTENSIONS if job == 'resample' else core.TRANSCODE_EXTENSIONS[job.upper()]
+    files = list(scan_audio_files(input_folder, extensions, recursive, exclude=output_folder))
+    if not files:
+        shutil.rmtree(queue_folder)
+        raise core.NoAudioFilesError(f"No valid audio files found in {input_folder}")
+
+    lease_size = max(1, lease_size)
+    leases = 0
+    for first in range(0, len(files), lease_size):
+        core.write_json_file(os.path.join(queue_folder, 'pending', f'lease_{leases:05d}.json'),
+                             {'files': files[first:first + lease_size], 'attempts': 0, 'errors': []}, indent=2)
+        leases += 1
+    core.write_json_file(os.path.join(queue_folder, 'job.json'),
+                         {'job': job, 'input_folder': input_folder, 'output_folder': output_folder,
+                          'settings': settings, 'lease_timeout': lease_timeout, 'files': len(files), 'leases': leases,
+                          'created': time.strftime('%Y-%m-%d %H:%M:%S')}, indent=2)
+    return {'files': len(files), 'leases': leases}
+
+# Work queue of an output folder (see the top of this file)
+class WorkQueue:
+    def __init__(self, output_folder):
+        self.folder = get_queue_folder(output_folder)
+        job_path = os.path.join(self.folder, 'job.json')
+        if not os.path.exists(job_path):
+            raise WorkQueueError(f"{output_folder} has no work queue")
+        self.job = _read_json(job_path)
+        self.lease_timeout = self.job['lease_timeout']
+
+    def _path(self, state, name):
+        return os.path.join(self.folder, state, name)
+
+    # Function to list the leases in a state, in order
+    def _list(self, state):
+        return sorted(name for name in os.listdir(os.path.join(self.folder, state)) if name.endswith('.json'))
+
+    # Function to get the current time of the file server, so lease ages do not depend on the clocks of the workers
+    def get_server_time(self):
+        clock_path = os.path.join(self.folder, 'clock')
+        with open(clock_path, 'a'):
+            pass
+        os.utime(clock_path)
+        return os.stat(clock_path).st_mtime
+
+    # Function to claim the next pending lease; returns a Lease, or None if no lease is pending
+    def claim(self, worker_id):
+        for name in self._list('pending'):
+            lease_name = f"{name[:-len('.json')]}@{worker_id}.json"
+            try:
+                # Touched before it is renamed (the rename keeps the time), so the lease times out from now: touched
+                # after, it would show up in leases with the time it was queued, and could be reclaimed at once
+                os.utime(self._path('pending', name))
+                os.rename(self._path('pending', name), self._path('leases', lease_name))
+                return Lease(self, lease_name)
+            except FileNotFoundError:
+                continue  # claimed by another worker first
+        return None
+
+    # Function to take a lease from its worker and put it back in pending with an error (in failed once it has been
+    # tried MAX_ATTEMPTS times, or as it was if count_attempt is False); returns False if the lease was already gone
+    def requeue(self, lease_name, error=None, count_attempt=True):
+        taken_path = self._path('leases', f"{lease_name}.{get_default_worker_id()}.requeue")
+        try:
+            os.rename(self._path('leases', lease_name), taken_path)
+        except FileNotFoundError:
+            return False  # completed, or requeued by another worker
+        lease = _read_json(taken_path)
+        if count_attempt:
+            lease['attempts'] += 1
+        if error:
+            lease['errors'].append(error)
+        state = 'failed' if lease['attempts'] >= MAX_ATTEMPTS else 'pending'
+        core.write_json_file(self._path(state, lease_name.split('@')[0] + '.json'), lease, indent=2)
+        os.remove(taken_path)
+        return True
+
+    # Function to put the leases whose workers stopped touching them back in the queue; returns how many there were
+    def reclaim_expired(self):
+        now = self.get_server_time()
+        reclaimed = 0
+        for lease_name in self._list('leases'):
+            try:
+                age = now - os.stat(self._path('leases', lease_name)).st_mtime
+            except FileNotFoundError:
+                continue
+            worker_id = lease_name[:-len('.json')].split('@', 1)[1]
+            if age > self.lease_timeout and self.requeue(lease_name, f"{worker_id}: lease timed out after {age:.0f} s"):
+                reclaimed += 1
+        return reclaimed
+
+    # Function to count the leases in each state
+    def get_status(self):
+        return {state: len(self._list(state)) for state in LEASE_STATES}
+
+    # Function to get the leases that failed MAX_ATTEMPTS times ({lease: its files, attempts and errors})
+    def get_failed_leases(self):
+        return {name[:-len('.json')]: _read_json(self._path('failed', name)) for name in self._list('failed')}
+
+    # Function to check if every lease is done or failed
+    def is_finished(self):
+        status = self.get_status()
+        return status['pending'] == 0 and status['leases'] == 0
+
+# Lease claimed by a worker: the files to process, and the means to keep it, finish it or give it back
+class Lease:
+    def __init__(self, queue, name):
+        self.queue = queue
+        self.name = name
+        self.id = name.split('@')[0]
+        self.path = queue._path('leases', name)
+        lease = _read_json(self.path)
+        self.files = lease['files']
+        self.attempts = lease['attempts']
+
+    # Function to touch the lease so it does not time out; returns False if it was lost (timed out and taken back)
+    def renew(self):
+        try:
+            os.utime(self.path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    # Function to keep the lease from timing out while its files are processed (touched from a background thread)
+    @contextmanager
+    def keep_alive(self):
+        stop = threading.Event()
+
+        def touch():
+            while not stop.wait(self.queue.lease_timeout / 4):
+                if not self.renew():
+                    return
+
+        thread = threading.Thread(target=touch, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    # Function to mark the lease done; returns False if it was lost (its files were then done twice, which is harmless)
+    def complete(self):
+        try:
+            os.rename(self.path, self.queue._path('done', self.id + '.json'))
+            return True
+        except FileNotFoundError:
+            return False
+
+    # Function to give the lease back after an error (counts as an attempt) or when the worker stops (does not count)
+    def fail(self, error):
+        return self.queue.requeue(self.name, error)
+
+    def release(self):
+        return self.queue.requeue(self.name, count_attempt=False)
+
+# Function to run the job of a queue on some of its files; kwargs are passed to resample_folder/transcode_folder
+def run_job(job, input_folder, output_folder, files, **kwargs):
+    settings = dict(job['settings'])
+    if job['job'] == 'resample':
+        return core.resample_folder(input_folder, output_folder, settings.pop('desired_sr'), files=files,
+                                    **settings, **kwargs)
+    kwargs.pop('num_workers', None)  # conversion has no worker processes
+    return core.transcode_folder(input_folder, output_folder, job['job'].upper(), files=files, **settings, **kwargs)
+
+# Function to run a worker (on any machine that sees the output folder): claims leases and processes their files until
+# every lease is done; leases held by other workers are waited for, and taken over if they time out
+# worker_id names the worker in the lease files and in its manifest (default: host name and process id); input_folder
+# replaces the input folder of the job on machines that mount it somewhere else; options (num_workers, pipeline,
+# readers, ...) are passed to resample_folder/transcode_folder
+# progress_callback(done, total, filename, report) is called after each file, with the files done by this worker,
+# the files of the whole job and the report.RunReport of this worker; cancel_event stops it like in resample_folder
+# (the lease in progress goes back to the queue)
+# Returns a summary of the worker's run (leases done and failed, files processed and skipped, the report)
+def run_worker(output_folder, worker_id=None, input_folder=None, progress_callback=None, cancel_event=None,
+               save_report=True, poll_interval=POLL_INTERVAL, **options):
+    queue = WorkQueue(output_folder)
+    job = queue.job
+    worker_id = worker_id or get_default_worker_id()
+    input_folder = input_folder or job['input_folder']
+    # Kept across the leases, so the manifest is read once and the report covers the worker's whole run
+    manifest = core.JobManifest(output_folder, worker_id)
+    report = RunReport(f"{job['job']}_{worker_id}", {'input_folder': input_folder, 'output_folder': output_folder,
+                                                     'worker_id': worker_id, **job['settings'], **options})
+    counts = {'done': 0, 'processed': 0, 'skipped': 0, 'leases': 0, 'failed': 0}
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    # Function to report the progress of a lease as progress of the worker
+    def update(done, total_files, filename, _):
+        if progress_callback:
+            progress_callback(counts['done'] + done, job['files'], filename, report)
+
+    while not cancelled():
+        lease = queue.claim(worker_id)
+        if lease is None:
+            # Nothing pending: take back the leases of workers that died, or wait for the others to finish theirs
+            if queue.reclaim_expired():
+                continue
+            if queue.is_finished():
+                break
+            if cancel_event is not None:
+                cancel_event.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+            continue
+
+        try:
+            with lease.keep_alive():
+                summary = run_job(job, input_folder, output_folder, lease.files, progress_callback=update,
+                                  cancel_event=cancel_event, save_report=False, manifest=manifest, report=report,
+                                  **options)
+        except Exception as e:
+            lease.fail(f"{worker_id}: {type(e).__name__}: {e}")
+            counts['failed'] += 1
+            continue
+
+        counts['done'] += summary['processed'] + summary['skipped']
+        counts['processed'] += summary['processed']
+        counts['skipped'] += summary['skipped']
+        if summary['cancelled']:
+            lease.release()  # the files finished so far are in the manifest, so they are not done again
+            break
+        lease.complete()
+        counts['leases'] += 1
+
+    return {'worker_id': worker_id, 'leases': counts['leases'], 'failed_leases': counts['failed'],
+            'processed': counts['processed'], 'skipped': counts['skipped'], 'cancelled': cancelled(),
+            'queue': queue.get_status(), 'report': report,
+            'report_path': report.save(output_folder) if save_report else None}
@@ -0,0 +1,5 @@
+# The repository has no package set-up: the tests import audiomate from the repository root
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,95 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import soundfile as sf
+from audiomate.workqueue import WorkQueue, create_work_queue, get_queue_folder, run_worker
+
+FILES = 10
+WORKERS = 3
+
+# Function to write short test recordings in a folder; returns their names
+def make_input_folder(folder):
+    os.makedirs(folder)
+    names = [f'take_{i:02d}.wav' for i in range(FILES)]
+    rng = np.random.default_rng(0)
+    for name in names:
+        sf.write(os.path.join(folder, name), 0.1 * rng.standard_normal(4800).astype(np.float32), 48000)
+    return names
+
+# Function to read the records of every manifest of an output folder
+def read_manifests(output_folder):
+    records = []
+    for name in os.listdir(output_folder):
+        if name.startswith('.ezaudiomate_manifest') and name.endswith('.jsonl'):
+            with open(os.path.join(output_folder, name), 'r', encoding='utf-8') as f:
+                records += [json.loads(line) for line in f]
+    return records
+
+def test_claimed_lease_is_not_reclaimed_at_once(tmp_path, monkeypatch):
+    input_folder, output_folder = str(tmp_path / 'in'), str(tmp_path / 'out')
+    make_input_folder(input_folder)
+    create_work_queue(input_folder, output_folder, 'resample', {'desired_sr': 16000}, lease_size=FILES,
+                      lease_timeout=60)
+    queue, other_worker = WorkQueue(output_folder), WorkQueue(output_folder)
+
+    # A lease that waited in pending for longer than the lease timeout
+    pending_path = os.path.join(get_queue_folder(output_folder), 'pending', 'lease_00000.json')
+    queued = time.time() - 3600
+    os.utime(pending_path, (queued, queued))
+
+    # Another worker looks for expired leases right after the lease is claimed
+    rename = os.rename
+    reclaimed = []
+
+    def rename_then_reclaim(source, destination):
+        rename(source, destination)
+        if source == pending_path:
+            reclaimed.append(other_worker.reclaim_expired())
+
+    monkeypatch.setattr(os, 'rename', rename_then_reclaim)
+    assert queue.claim('worker') is not None
+    assert reclaimed == [0]
+    assert queue.get_status()['leases'] == 1
+
+def test_queue_with_relative_folders(tmp_path, monkeypatch):
+    make_input_folder(str(tmp_path / 'in'))
+    monkeypatch.chdir(tmp_path)
+    create_work_queue('in', 'out', 'resample', {'desired_sr': 16000})
+
+    # A worker started from another folder still finds the input files
+    monkeypatch.chdir(tmp_path / 'in')
+    summary = run_worker(str(tmp_path / 'out'), worker_id='worker', save_report=False)
+    assert summary['processed'] == FILES and summary['failed_leases'] == 0
+
+def test_workers_process_every_file_once(tmp_path):
+    input_folder, output_folder = str(tmp_path / 'in'), str(tmp_path / 'out')
+    names = make_input_folder(input_folder)
+    create_work_queue(input_folder, output_folder, 'resample', {'desired_sr': 16000}, lease_size=2, lease_timeout=2)
+
+    # A worker that claims a lease and dies: its lease has to time out and be taken over by another worker
+    dead_lease = WorkQueue(output_folder).claim('dead')
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=WORKERS, mp_context=context) as executor:
+        futures = [executor.submit(run_worker, output_folder, worker_id=f'worker{i}', poll_interval=0.2,
+                                   save_report=False) for i in range(WORKERS)]
+        summaries = [future.result(timeout=120) for future in futures]
+
+    assert sum(summary['processed'] for summary in summaries) == FILES
+    assert sum(summary['failed_leases'] for summary in summaries) == 0
+    assert WorkQueue(output_folder).get_status() == {'pending': 0, 'leases': 0, 'done': FILES // 2, 'failed': 0}
+
+    # Every file was processed by exactly one worker, and written
+    records = read_manifests(output_folder)
+    assert Counter(record['input'] for record in records) == Counter(names)
+    assert all(os.path.exists(os.path.join(output_folder, record['output'])) for record in records)
+
+    # The lease of the dead worker timed out, went back to the queue and was done by a live worker
+    done_lease = os.path.join(get_queue_folder(output_folder), 'done', dead_lease.id + '.json')
+    with open(done_lease, 'r', encoding='utf-8') as f:
+        errors = json.load(f)['errors']
+    assert len(errors) == 1 and errors[0].startswith('dead: lease timed out')